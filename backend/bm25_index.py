@@ -0,0 +1,316 @@
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from tokenizer import tokenize
+
+# BM25 index configuration; SEARCH_BACKEND=bm25 serves /api/search from this index instead of Mongo
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "mongo").lower()
+BM25_SEARCH_ENABLED = SEARCH_BACKEND == "bm25"
+BM25_SNAPSHOT_PATH = os.environ.get("BM25_SNAPSHOT_PATH", str(Path(__file__).parent / "search_index" / "bm25.idx"))
+BM25_SNAPSHOT_SECONDS = int(os.environ.get("BM25_SNAPSHOT_SECONDS", "600"))
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 2  # Title tokens are counted this many times
+SNAPSHOT_VERSION = 1
+# Documents created this long before the snapshot watermark are re-read on startup, for late commits
+CATCH_UP_SLACK_SECONDS = 300
+
+KINDS = ("articles", "content")
+_HEADER = struct.Struct("<4sQ")
+_MAGIC = b"BM25"
+
+def encode_varint(out: bytearray, value: int):
+    """Append a non-negative integer as a little-endian base-128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varints(buffer) -> np.ndarray:
+    """Decode a buffer of varints in one vectorized pass"""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if not len(data):
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(data < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    shifts = (np.arange(len(data)) - np.repeat(starts, ends - starts + 1)) * 7
+    return np.add.reduceat((data & 0x7F).astype(np.int64) << shifts, starts)
+
+class _Postings:
+    """One term's postings: delta-encoded document numbers and term frequencies as varint streams
+
+    base_* are read-only views into the loaded snapshot; documents added since are appended to the
+    tail bytearrays, so a restored index is never copied out of the memory map.
+    """
+
+    __slots__ = ("base_docs", "base_freqs", "docs", "freqs", "last_doc", "df")
+
+    def __init__(self, base_docs=b"", base_freqs=b"", last_doc: int = 0, df: int = 0):
+        self.base_docs = base_docs
+        self.base_freqs = base_freqs
+        self.docs = bytearray()
+        self.freqs = bytearray()
+        self.last_doc = last_doc
+        self.df = df
+
+    def append(self, docno: int, frequency: int):
+        encode_varint(self.docs, docno - self.last_doc)
+        encode_varint(self.freqs, frequency)
+        self.last_doc = docno
+        self.df += 1
+
+    def decode(self) -> Tuple[np.ndarray, np.ndarray]:
+        deltas = decode_varints(self.base_docs)
+        frequencies = decode_varints(self.base_freqs)
+        if self.docs:
+            deltas = np.concatenate((deltas, decode_varints(self.docs)))
+            frequencies = np.concatenate((frequencies, decode_varints(self.freqs)))
+        return np.cumsum(deltas), frequencies
+
+def document_text(doc: Dict) -> str:
+    """Indexed text of an article or generated content document, with the title boosted"""
+    title = doc.get("title") or ""
+    body = doc.get("content") or doc.get("summary") or ""
+    return " ".join([title] * TITLE_BOOST + [body])
+
+class BM25Index:
+    """In-process BM25 inverted index over news articles and generated content
+
+    Documents are numbered in insertion order; per-document lengths and kinds live in NumPy arrays
+    and each term's postings in compact varint streams. The index is snapshotted to a single file
+    that is memory-mapped on startup, and only documents created after the snapshot are read back
+    from Mongo.
+    """
+
+    def __init__(self, path: str = BM25_SNAPSHOT_PATH, snapshot_seconds: int = BM25_SNAPSHOT_SECONDS):
+        self.path = Path(path)
+        self.snapshot_seconds = snapshot_seconds
+        self.ready = False
+        self.doc_ids: List[str] = []
+        self._docnos: Dict[str, int] = {}
+        self._lengths = np.zeros(1024, dtype=np.uint32)
+        self._kinds = np.zeros(1024, dtype=np.uint8)
+        self._total_length = 0
+        self._postings: Dict[str, _Postings] = {}
+        self._watermark: Optional[datetime] = None
+        self._dirty = False
+        # Set once the snapshot is loaded: ingestion may add documents from then on, before the catch-up ends
+        self._loaded = False
+        self._mmap: Optional[mmap.mmap] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def add(self, kind: str, doc_id: str, text: str, created_at: Optional[datetime] = None) -> bool:
+        """Index one document; documents already in the index are skipped"""
+        if doc_id in self._docnos:
+            return False
+        docno = len(self.doc_ids)
+        if docno == len(self._lengths):
+            self._lengths = np.concatenate((self._lengths, np.zeros(docno, dtype=np.uint32)))
+            self._kinds = np.concatenate((self._kinds, np.zeros(docno, dtype=np.uint8)))
+        terms = tokenize(text)
+        for term, frequency in Counter(terms).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.append(docno, frequency)
+        self.doc_ids.append(doc_id)
+        self._docnos[doc_id] = docno
+        self._lengths[docno] = len(terms)
+        self._kinds[docno] = KINDS.index(kind)
+        self._total_length += len(terms)
+        if created_at is not None:
+            created_at = created_at if created_at.tzinfo else created_at.replace(tzinfo=timezone.utc)
+            if self._watermark is None or created_at > self._watermark:
+                self._watermark = created_at
+        self._dirty = True
+        return True
+
+    def add_documents(self, kind: str, docs: Iterable[Dict]) -> int:
+        """Index documents as they are ingested; a no-op until the snapshot has been loaded"""
+        if not self._loaded:
+            return 0
+        return sum(self.add(kind, doc["id"], document_text(doc), doc.get("created_at")) for doc in docs)
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Tuple[str, float]]:
+        """(document id, score) pairs for the top BM25 matches of the query, optionally of one kind"""
+        n_docs = len(self.doc_ids)
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self._postings]
+        if not n_docs or not terms or limit <= 0:
+            return []
+
+        lengths = self._lengths[:n_docs].astype(np.float32)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (self._total_length / n_docs))
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for term in terms:
+            postings = self._postings[term]
+            docnos, frequencies = postings.decode()
+            idf = np.log(1 + (n_docs - postings.df + 0.5) / (postings.df + 0.5))
+            scores[docnos] += idf * frequencies * (BM25_K1 + 1) / (frequencies + length_norm[docnos])
+
+        if kind is not None:
+            scores[self._kinds[:n_docs] != KINDS.index(kind)] = 0
+        matches = np.flatnonzero(scores)
+        if len(matches) > limit:
+            matches = matches[np.argpartition(-scores[matches], limit - 1)[:limit]]
+        # Best score first; later (newer) documents first on ties
+        matches = matches[np.lexsort((-matches, -scores[matches]))]
+        return [(self.doc_ids[docno], float(scores[docno])) for docno in matches]
+
+    def _freeze(self) -> Tuple:
+        """Pin the current state for a snapshot without copying it
+
+        Documents are only ever appended: rows of the per-document arrays and bytes of the postings
+        tails never change once written, so recording their current lengths is a consistent view
+        that adds made meanwhile cannot disturb.
+        """
+        postings = [
+            (term, p.base_docs, p.docs, len(p.docs), p.base_freqs, p.freqs, len(p.freqs), p.last_doc, p.df)
+            for term, p in self._postings.items()
+        ]
+        return (self.doc_ids, len(self.doc_ids), self._lengths, self._kinds, self._watermark,
+                self._total_length, postings)
+
+    @staticmethod
+    def _serialize(frozen: Tuple) -> bytes:
+        """Snapshot file contents: fixed header, JSON metadata, then the lengths, kinds and postings blob"""
+        doc_ids, n_docs, lengths, kinds, watermark, total_length, postings = frozen
+        chunks = [lengths[:n_docs].tobytes(), kinds[:n_docs].tobytes()]
+        offset = sum(len(chunk) for chunk in chunks)
+        terms = {}
+        for term, base_docs, tail_docs, docs_length, base_freqs, tail_freqs, freqs_length, last_doc, df in postings:
+            docs = bytes(base_docs) + bytes(tail_docs[:docs_length])
+            freqs = bytes(base_freqs) + bytes(tail_freqs[:freqs_length])
+            terms[term] = [offset, len(docs), len(freqs), last_doc, df]
+            chunks.extend((docs, freqs))
+            offset += len(docs) + len(freqs)
+        meta = json.dumps({
+            "version": SNAPSHOT_VERSION,
+            "watermark": watermark.isoformat() if watermark else None,
+            "total_length": total_length,
+            "doc_ids": doc_ids[:n_docs],
+            "terms": terms,
+        }, ensure_ascii=False).encode("utf-8")
+        return b"".join([_HEADER.pack(_MAGIC, len(meta)), meta] + chunks)
+
+    def _write(self, frozen: Tuple):
+        data = self._serialize(frozen)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temporary, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+
+    async def save(self):
+        """Write a snapshot; the state is pinned on the event loop, then serialized and written in a thread"""
+        frozen = self._freeze()
+        self._dirty = False
+        await asyncio.to_thread(self._write, frozen)
+        logging.info(f"BM25 snapshot saved: {len(self.doc_ids)} documents, {len(self._postings)} terms")
+
+    def load(self) -> bool:
+        """Restore the index from the snapshot file, keeping postings as views into a memory map"""
+        if not self.path.exists():
+            return False
+        with open(self.path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        magic, meta_length = _HEADER.unpack_from(view)
+        meta = json.loads(bytes(view[_HEADER.size:_HEADER.size + meta_length]).decode("utf-8"))
+        if magic != _MAGIC or meta.get("version") != SNAPSHOT_VERSION:
+            logging.warning(f"Ignoring incompatible BM25 snapshot at {self.path}")
+            return False
+
+        blob = view[_HEADER.size + meta_length:]
+        n_docs = len(meta["doc_ids"])
+        capacity = max(1024, 2 * n_docs)
+        self._lengths = np.zeros(capacity, dtype=np.uint32)
+        self._kinds = np.zeros(capacity, dtype=np.uint8)
+        self._lengths[:n_docs] = np.frombuffer(blob, dtype=np.uint32, count=n_docs)
+        self._kinds[:n_docs] = np.frombuffer(blob, dtype=np.uint8, count=n_docs, offset=4 * n_docs)
+        self.doc_ids = meta["doc_ids"]
+        self._docnos = {doc_id: docno for docno, doc_id in enumerate(self.doc_ids)}
+        self._total_length = meta["total_length"]
+        self._postings = {}
+        for term, (offset, docs_length, freqs_length, last_doc, df) in meta["terms"].items():
+            self._postings[term] = _Postings(
+                blob[offset:offset + docs_length],
+                blob[offset + docs_length:offset + docs_length + freqs_length],
+                last_doc, df,
+            )
+        self._watermark = datetime.fromisoformat(meta["watermark"]) if meta["watermark"] else None
+        self._mmap = mapped
+        self._dirty = False
+        return True
+
+    async def _index_collection(self, kind: str, collection, query: Dict) -> int:
+        projection = {"_id": 0, "id": 1, "title": 1, "summary": 1, "content": 1, "created_at": 1}
+        added = 0
+        async for doc in collection.find(query, projection).sort("created_at", 1):
+            added += self.add(kind, doc["id"], document_text(doc), doc.get("created_at"))
+        return added
+
+    async def build(self, articles_collection, content_collection):
+        """Load the snapshot (or build from Mongo) and catch up on newer documents; searches wait until it finishes"""
+        try:
+            loaded = await asyncio.to_thread(self.load)
+        except Exception as e:
+            logging.error(f"Failed to load BM25 snapshot, rebuilding: {str(e)}")
+            loaded = False
+        query = {}
+        if loaded and self._watermark is not None:
+            since = self._watermark.timestamp() - CATCH_UP_SLACK_SECONDS
+            query = {"created_at": {"$gte": datetime.fromtimestamp(since, tz=timezone.utc)}}
+        # Ingestion may add documents while the catch-up reads run; both paths skip known ids
+        self._loaded = True
+        added = await self._index_collection("articles", articles_collection, query)
+        added += await self._index_collection("content", content_collection, query)
+        self.ready = True
+        logging.info(f"BM25 index ready: {len(self.doc_ids)} documents ({added} read from Mongo)")
+
+    def start(self, articles_collection, content_collection):
+        """Build the index in the background, then snapshot it periodically"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(articles_collection, content_collection))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            # A partial build must not be saved: its watermark would skip the documents not read yet
+            if self._dirty and self.ready:
+                await self.save()
+
+    async def _run(self, articles_collection, content_collection):
+        try:
+            await self.build(articles_collection, content_collection)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"BM25 index build failed: {str(e)}")
+            return
+        while True:
+            await asyncio.sleep(self.snapshot_seconds)
+            if not self._dirty:
+                continue
+            try:
+                await self.save()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"BM25 snapshot failed: {str(e)}")
@@ -0,0 +1,41 @@
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+# Breaker configuration (delays in seconds)
+FEED_BREAKER_THRESHOLD = int(os.environ.get("FEED_BREAKER_THRESHOLD", "3"))
+FEED_BREAKER_BASE_DELAY = int(os.environ.get("FEED_BREAKER_BASE_DELAY", "600"))
+FEED_BREAKER_MAX_DELAY = int(os.environ.get("FEED_BREAKER_MAX_DELAY", "86400"))
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Mongo hands datetimes back naive; they are stored as UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def breaker_allows(feed: Dict, now: Optional[datetime] = None) -> bool:
+    """Whether a feed may be fetched: closed circuits always, open ones only once their retry time passes"""
+    if feed.get("consecutive_failures", 0) < FEED_BREAKER_THRESHOLD:
+        return True
+    retry_at = _as_utc(feed.get("retry_at"))
+    return retry_at is None or retry_at <= (now or datetime.now(timezone.utc))
+
+def breaker_update(feed: Dict, error: Optional[str], now: Optional[datetime] = None) -> Dict:
+    """Fields to $set on the feed after a fetch attempt (error is None on success)"""
+    now = now or datetime.now(timezone.utc)
+    if error is None:
+        return {"consecutive_failures": 0, "circuit_state": "closed", "retry_at": None}
+
+    failures = feed.get("consecutive_failures", 0) + 1
+    update = {"consecutive_failures": failures, "last_error": error[:500], "last_failure_at": now}
+    if failures < FEED_BREAKER_THRESHOLD:
+        update["circuit_state"] = "closed"
+        update["retry_at"] = None
+        return update
+
+    # Open (or re-open after a failed half-open trial) with exponential backoff and jitter
+    delay = min(FEED_BREAKER_MAX_DELAY, FEED_BREAKER_BASE_DELAY * 2 ** (failures - FEED_BREAKER_THRESHOLD))
+    update["circuit_state"] = "open"
+    update["retry_at"] = now + timedelta(seconds=delay * random.uniform(0.9, 1.1))
+    return update
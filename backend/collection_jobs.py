@@ -0,0 +1,123 @@
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+MAX_RUNS_IN_MEMORY = 20
+SSE_HEARTBEAT_SECONDS = 15
+# Per-feed outcome counters reported for every run
+RUN_COUNTERS = ("fetched", "not_modified", "unchanged", "failed", "circuit_open", "parsed", "duplicates", "inserted")
+
+class CollectionRun:
+    """One article collection run: per-feed progress, totals and live event fan-out"""
+
+    def __init__(self, feeds_total: int, trigger: str = "manual"):
+        self.id = str(uuid.uuid4())
+        self.trigger = trigger
+        self.status = "running"
+        self.feeds_total = feeds_total
+        self.feeds_done = 0
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.totals = {counter: 0 for counter in RUN_COUNTERS}
+        self.feed_results: List[Dict] = []
+        self.events: List[Dict] = []
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    def publish(self, event: Dict):
+        """Record an event and push it to every live subscriber"""
+        event = {"run_id": self.id, "at": datetime.now(timezone.utc), **event}
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def feed_stage(self, feed: Dict, stage: str, **details):
+        """Report an intermediate stage (fetched, not_modified, unchanged, failed, circuit_open) for one feed"""
+        self.publish({"type": "feed_stage", "feed_id": feed["id"], "feed": feed["title"], "stage": stage, **details})
+
+    def feed_finished(self, stats: Dict):
+        """Fold one feed's final stats into the run totals"""
+        self.feeds_done += 1
+        self.feed_results.append(stats)
+        fetch_status = stats["status"] if stats["status"] != "ok" else "fetched"
+        self.totals[fetch_status] = self.totals.get(fetch_status, 0) + 1
+        for counter in ("parsed", "duplicates", "inserted"):
+            self.totals[counter] += stats.get(counter, 0)
+        self.publish({"type": "feed_done", "feeds_done": self.feeds_done, "feeds_total": self.feeds_total, **stats})
+
+    def finish(self, status: str = "completed", error: Optional[str] = None):
+        self.status = status
+        self.finished_at = datetime.now(timezone.utc)
+        self.publish({"type": "run_done", **self.summary(), "error": error})
+
+    def summary(self) -> Dict:
+        """Serializable run state, including the feeds that dominated wall time"""
+        end = self.finished_at or datetime.now(timezone.utc)
+        return {
+            "id": self.id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "feeds_total": self.feeds_total,
+            "feeds_done": self.feeds_done,
+            "totals": dict(self.totals),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed": round((end - self.started_at).total_seconds(), 3),
+            "slowest_feeds": sorted(self.feed_results, key=lambda r: r["elapsed"], reverse=True)[:10],
+        }
+
+    async def stream(self) -> AsyncIterator[Optional[Dict]]:
+        """Replay past events, then yield live ones until the run ends (None marks a heartbeat)"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        try:
+            for event in list(self.events):
+                yield event
+            if self.status != "running":
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event["type"] == "run_done":
+                    return
+        finally:
+            self._subscribers.discard(queue)
+
+class CollectionRunRegistry:
+    """Keeps recent runs in memory for streaming and persists their summaries to Mongo"""
+
+    def __init__(self, runs_collection):
+        self.runs_collection = runs_collection
+        self._runs: "OrderedDict[str, CollectionRun]" = OrderedDict()
+
+    def create(self, feeds_total: int, trigger: str = "manual") -> CollectionRun:
+        run = CollectionRun(feeds_total, trigger)
+        self._runs[run.id] = run
+        while len(self._runs) > MAX_RUNS_IN_MEMORY:
+            self._runs.popitem(last=False)
+        return run
+
+    def get(self, run_id: str) -> Optional[CollectionRun]:
+        return self._runs.get(run_id)
+
+    async def persist(self, run: CollectionRun):
+        await self.runs_collection.replace_one({"id": run.id}, run.summary(), upsert=True)
+
+    async def load_summary(self, run_id: str) -> Optional[Dict]:
+        """Summary of a run, from memory if it is recent and from Mongo otherwise"""
+        run = self.get(run_id)
+        if run is not None:
+            return run.summary()
+        return await self.runs_collection.find_one({"id": run_id}, {"_id": 0})
+
+def format_sse(event: Optional[Dict]) -> str:
+    """Encode an event (or a heartbeat comment for None) in text/event-stream format"""
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+from feed_fetcher import FeedFetcher
+from feed_parser import HAS_LXML, FeedParserPool, html_to_text
+
+if HAS_LXML:
+    import lxml.html
+
+# Extraction configuration; kept separate from feed polling so page downloads never slow it down
+ARTICLE_EXTRACTION_ENABLED = os.environ.get("ARTICLE_EXTRACTION_ENABLED", "false").lower() == "true"
+EXTRACT_CONCURRENCY = int(os.environ.get("EXTRACT_CONCURRENCY", "8"))
+EXTRACT_PER_HOST = int(os.environ.get("EXTRACT_PER_HOST", "1"))
+EXTRACT_HOST_DELAY = float(os.environ.get("EXTRACT_HOST_DELAY", "1.0"))
+EXTRACT_TIMEOUT = float(os.environ.get("EXTRACT_TIMEOUT", "15"))
+EXTRACT_MAX_BYTES = int(os.environ.get("EXTRACT_MAX_BYTES", str(2 * 1024 * 1024)))
+EXTRACT_PARSER_WORKERS = int(os.environ.get("EXTRACT_PARSER_WORKERS", "1"))
+EXTRACT_QUEUE_SIZE = int(os.environ.get("EXTRACT_QUEUE_SIZE", "1000"))
+CONTENT_MAX_CHARS = 20000
+MIN_PARAGRAPH_CHARS = 25
+BOILERPLATE_XPATH = '//script|//style|//noscript|//nav|//header|//footer|//aside|//form'
+
+class _ParagraphCollector(HTMLParser):
+    """Fallback extractor that keeps the text of substantial <p> elements outside page chrome"""
+
+    SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs: List[str] = []
+        self.skip_depth = 0
+        self.current: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "p" and not self.skip_depth:
+            self.current = []
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag == "p" and self.current is not None:
+            text = " ".join("".join(self.current).split())
+            if len(text) >= MIN_PARAGRAPH_CHARS:
+                self.paragraphs.append(text)
+            self.current = None
+
+    def handle_data(self, data):
+        if self.current is not None and not self.skip_depth:
+            self.current.append(data)
+
+def extract_main_text(html: bytes, max_chars: int = CONTENT_MAX_CHARS) -> str:
+    """Readability-style extraction: pick the container whose paragraphs carry the most text"""
+    if not HAS_LXML:
+        collector = _ParagraphCollector()
+        collector.feed(html.decode("utf-8", errors="replace"))
+        collector.close()
+        return "\n\n".join(collector.paragraphs)[:max_chars]
+
+    try:
+        doc = lxml.html.fromstring(html)
+    except Exception:
+        return ""
+    for element in doc.xpath(BOILERPLATE_XPATH):
+        element.drop_tree()
+
+    # Score each paragraph's parent (and, at half weight, grandparent) by the text it holds
+    scores: Dict = {}
+    for paragraph in doc.iter("p"):
+        text = paragraph.text_content().strip()
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = paragraph.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0) + score
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0) + score / 2
+
+    if not scores:
+        return html_to_text(lxml.html.tostring(doc, encoding="unicode"), max_chars)
+
+    best = max(scores, key=scores.get)
+    paragraphs = [" ".join(p.text_content().split()) for p in best.iter("p")]
+    return "\n\n".join(p for p in paragraphs if len(p) >= MIN_PARAGRAPH_CHARS)[:max_chars]
+
+class ArticleExtractor:
+    """Background stage that downloads article pages and stores their main text as content"""
+
+    def __init__(self, articles_collection, workers: int = EXTRACT_CONCURRENCY):
+        self.articles = articles_collection
+        self.workers = workers
+        # Dedicated download and parse pools (with a per-host delay) keep extraction polite and
+        # isolated from feed polling
+        self.parser_pool = FeedParserPool(EXTRACT_PARSER_WORKERS)
+        self.fetcher = FeedFetcher(
+            concurrency=workers,
+            per_host=EXTRACT_PER_HOST,
+            timeout=EXTRACT_TIMEOUT,
+            host_delay=EXTRACT_HOST_DELAY
+        )
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=EXTRACT_QUEUE_SIZE)
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the extraction workers"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers and close the page fetcher"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.fetcher.close()
+        self.parser_pool.close()
+
+    def enqueue(self, articles: List[Dict]) -> int:
+        """Queue articles for extraction without waiting; returns how many were accepted"""
+        if not self._tasks:
+            return 0
+        accepted = 0
+        for article in articles:
+            try:
+                self.queue.put_nowait({"url_hash": article["url_hash"], "url": article["url"]})
+                accepted += 1
+            except asyncio.QueueFull:
+                logging.warning(f"Extraction queue full, skipped {len(articles) - accepted} articles")
+                break
+        return accepted
+
+    async def _worker(self):
+        while True:
+            article = await self.queue.get()
+            try:
+                await self.extract(article)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error extracting article {article['url']}: {str(e)}")
+                await self.articles.update_one(
+                    {"url_hash": article["url_hash"]},
+                    {"$set": {"content_status": "failed"}}
+                )
+            finally:
+                self.queue.task_done()
+
+    async def extract(self, article: Dict):
+        """Download one article page within the byte budget and store its main text"""
+        response = await self.fetcher.fetch(article["url"], max_bytes=EXTRACT_MAX_BYTES)
+        content_type = response["headers"].get("Content-Type", "")
+        if "html" not in content_type:
+            await self.articles.update_one({"url_hash": article["url_hash"]}, {"$set": {"content_status": "skipped"}})
+            return
+
+        text = await self.parser_pool.run(extract_main_text, response["content"])
+        update = {"content_status": "extracted" if text else "empty", "content_extracted_at": datetime.now(timezone.utc)}
+        if text:
+            update["content"] = text
+        await self.articles.update_one({"url_hash": article["url_hash"]}, {"$set": update})
@@ -0,0 +1,85 @@
+import asyncio
+import os
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+# Fetcher configuration
+FEED_FETCH_CONCURRENCY = int(os.environ.get("FEED_FETCH_CONCURRENCY", "32"))
+FEED_FETCH_PER_HOST = int(os.environ.get("FEED_FETCH_PER_HOST", "2"))
+FEED_FETCH_TIMEOUT = float(os.environ.get("FEED_FETCH_TIMEOUT", "30"))
+USER_AGENT = "TechPulseAI/1.1 (+https://techpulse.ai)"
+
+class FeedFetcher:
+    """Async HTTP fetcher with a shared connection pool, a global cap and a per-host cap"""
+
+    def __init__(self, concurrency: int = FEED_FETCH_CONCURRENCY, per_host: int = FEED_FETCH_PER_HOST,
+                 timeout: float = FEED_FETCH_TIMEOUT, host_delay: float = 0):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.host_delay = host_delay  # Minimum seconds between requests to the same host
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._global_limit = asyncio.Semaphore(concurrency)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._host_last_request: Dict[str, float] = {}
+
+    async def start(self):
+        """Open the shared session (idempotent)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": USER_AGENT},
+            )
+
+    async def close(self):
+        """Close the shared session and its connection pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def _wait_for_host(self, host: str):
+        if not self.host_delay:
+            return
+        loop = asyncio.get_running_loop()
+        wait = self._host_last_request.get(host, 0) + self.host_delay - loop.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._host_last_request[host] = loop.time()
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, max_bytes: Optional[int] = None) -> Dict:
+        """Fetch a URL and return its status, headers and body; raises on network or HTTP errors
+
+        With max_bytes the body is streamed and cut off once the budget is reached.
+        """
+        await self.start()
+        host = urlparse(url).netloc.lower()
+        async with self._host_limit(host):
+            await self._wait_for_host(host)
+            async with self._global_limit:
+                async with self._session.get(url, headers=headers) as response:
+                    response.raise_for_status()
+                    if max_bytes is None:
+                        content = await response.read()
+                    else:
+                        chunks = []
+                        size = 0
+                        async for chunk in response.content.iter_chunked(64 * 1024):
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if size >= max_bytes:
+                                break
+                        content = b"".join(chunks)[:max_bytes]
+                    return {
+                        "status": response.status,
+                        "headers": response.headers.copy(),
+                        "content": content,
+                    }
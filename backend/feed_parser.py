@@ -0,0 +1,155 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional
+
+import feedparser
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:  # lxml is optional; the streaming stripper below covers it
+    HAS_LXML = False
+
+# Parser pool configuration (0 workers parses on a thread instead of a process pool)
+FEED_PARSER_WORKERS = int(os.environ.get("FEED_PARSER_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Upper bound on entries taken from one fetch
+FEED_MAX_ENTRIES = int(os.environ.get("FEED_MAX_ENTRIES", "50"))
+SUMMARY_MAX_CHARS = 500
+
+class _TextStripper(HTMLParser):
+    """Streaming HTML stripper that stops collecting once it has enough text"""
+
+    SKIP_TAGS = {"script", "style", "noscript"}
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.parts: List[str] = []
+        self.size = 0
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if self.skip_depth or self.size >= self.limit:
+            return
+        self.parts.append(data)
+        self.size += len(data)
+
+def html_to_text(html: str, limit: int = SUMMARY_MAX_CHARS) -> str:
+    """Convert an HTML fragment to collapsed plain text of at most `limit` characters"""
+    if not html:
+        return ""
+    if "<" not in html and "&" not in html:
+        text = html
+    elif HAS_LXML:
+        try:
+            doc = lxml.html.fromstring(html)
+            for element in doc.xpath('//script|//style|//noscript'):
+                element.drop_tree()
+            text = doc.text_content()
+        except Exception:
+            text = ""
+    else:
+        stripper = _TextStripper(limit * 2)
+        stripper.feed(html)
+        stripper.close()
+        text = "".join(stripper.parts)
+    return " ".join(text.split())[:limit]
+
+def _entry_image(entry) -> Optional[str]:
+    if entry.get('media_content'):
+        return entry.media_content[0].get('url')
+    for enclosure in entry.get('enclosures', []):
+        if enclosure.get('type', '').startswith('image/'):
+            return enclosure.get('href')
+    return None
+
+def _entry_published(entry) -> Optional[datetime]:
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not parsed:
+        return None
+    return datetime(*parsed[:6], tzinfo=timezone.utc)
+
+def parse_feed_entries(content: bytes, limit: int = FEED_MAX_ENTRIES, known_ids: Optional[Iterable[str]] = None,
+                       since: Optional[datetime] = None) -> Dict:
+    """Parse raw feed bytes into plain article dicts, skipping entries seen on the last fetch (runs inside a worker process)"""
+    feed = feedparser.parse(content)
+    known_ids = set(known_ids or [])
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    articles = []
+    entry_ids = []
+    latest_published = since
+
+    for entry in feed.entries[:limit]:
+        entry_id = entry.get('id') or entry.get('link', '')
+        entry_ids.append(entry_id)
+        # Ranked feeds reorder and insert older items, so only an entry's own ID says it was seen
+        if entry_id in known_ids:
+            continue
+
+        published = _entry_published(entry)
+        if published is not None:
+            # The time watermark only decides for entries the ID set cannot (no ID, or no IDs stored yet)
+            if since is not None and published <= since and (not entry_id or not known_ids):
+                continue
+            if latest_published is None or published > latest_published:
+                latest_published = published
+
+        articles.append({
+            'title': entry.get('title', '').strip(),
+            'summary': html_to_text(entry.get('summary', entry.get('description', ''))),
+            'url': entry.get('link', ''),
+            'published_date': published or datetime.now(timezone.utc),
+            'image_url': _entry_image(entry)
+        })
+
+    return {
+        "articles": articles,
+        "watermark": {"last_entry_ids": entry_ids, "last_published_at": latest_published},
+    }
+
+class FeedParserPool:
+    """Bounded process pool that keeps feedparser and HTML stripping off the event loop"""
+
+    def __init__(self, workers: int = FEED_PARSER_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Cap in-flight submissions so a large run does not queue every feed body in memory
+        self._in_flight = asyncio.Semaphore(max(1, workers) * 2)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def run(self, func, *args):
+        """Run a picklable CPU-bound function in the pool"""
+        async with self._in_flight:
+            executor = self._get_executor()
+            if executor is None:
+                return await asyncio.to_thread(func, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, func, *args)
+
+    async def parse(self, content: bytes, limit: int = FEED_MAX_ENTRIES, known_ids: Optional[List[str]] = None,
+                    since: Optional[datetime] = None) -> Dict:
+        """Parse feed bytes in the pool and return new article dicts plus the updated watermark"""
+        return await self.run(parse_feed_entries, content, limit, known_ids, since)
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
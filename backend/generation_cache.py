@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+# Generation cache configuration
+GENERATION_CACHE_TTL_SECONDS = int(os.environ.get("GENERATION_CACHE_TTL_SECONDS", "21600"))
+GENERATION_CACHE_MAX_ENTRIES = int(os.environ.get("GENERATION_CACHE_MAX_ENTRIES", "512"))
+
+def generation_cache_key(article_ids: List[str], language: str, tone: str, length: str,
+                         include_seo: bool, template_version: int) -> str:
+    """Stable hash of everything that shapes the prompt; article order does not matter"""
+    payload = json.dumps(
+        [sorted(article_ids), language, tone, length, include_seo, template_version],
+        ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class GenerationCache:
+    """In-process LRU of generated content with a TTL, so repeated requests skip the LLM call"""
+
+    def __init__(self, ttl_seconds: int = GENERATION_CACHE_TTL_SECONDS, max_entries: int = GENERATION_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: Any):
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+# Generation job configuration
+GENERATION_WORKERS = int(os.environ.get("GENERATION_WORKERS", "4"))
+GENERATION_JOB_POLL_SECONDS = float(os.environ.get("GENERATION_JOB_POLL_SECONDS", "5"))
+# A job still "running" after this long belonged to a worker that died; it is queued again
+GENERATION_JOB_TIMEOUT = int(os.environ.get("GENERATION_JOB_TIMEOUT", "600"))
+GENERATION_JOB_MAX_ATTEMPTS = 3
+GENERATION_JOB_RETENTION_DAYS = int(os.environ.get("GENERATION_JOB_RETENTION_DAYS", "7"))
+
+JOB_FIELDS = {"_id": 0, "id": 1, "status": 1, "user_id": 1, "created_at": 1, "started_at": 1,
+              "finished_at": 1, "attempts": 1, "result_id": 1, "error": 1}
+
+class GenerationJobQueue:
+    """Generation jobs persisted in Mongo and run by a bounded pool of workers
+
+    Workers claim queued jobs with an atomic find_one_and_update, so jobs survive restarts and
+    several API processes can share one queue. Submissions wake an idle worker immediately; jobs
+    queued by another process are picked up within GENERATION_JOB_POLL_SECONDS.
+    """
+
+    def __init__(self, jobs_collection, run_job: Callable[[Dict], Awaitable[str]], workers: int = GENERATION_WORKERS):
+        self.collection = jobs_collection
+        self.run_job = run_job
+        self.workers = workers
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("id", unique=True)
+        await self.collection.create_index([("status", 1), ("created_at", 1)])
+        await self.collection.create_index("finished_at", expireAfterSeconds=GENERATION_JOB_RETENTION_DAYS * 86400)
+
+    async def submit(self, request: Dict, user_id: str) -> Dict:
+        job = {
+            "id": str(uuid.uuid4()),
+            "status": "queued",
+            "request": request,
+            "user_id": user_id,
+            "attempts": 0,
+            "created_at": datetime.now(timezone.utc),
+        }
+        await self.collection.insert_one(dict(job))
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await self.collection.find_one({"id": job_id}, JOB_FIELDS)
+
+    async def _claim(self) -> Optional[Dict]:
+        return await self.collection.find_one_and_update(
+            {"status": "queued"},
+            {"$set": {"status": "running", "started_at": datetime.now(timezone.utc)}, "$inc": {"attempts": 1}},
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def requeue_stale(self) -> int:
+        """Queue again the jobs whose worker stopped without finishing them, failing those out of attempts"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=GENERATION_JOB_TIMEOUT)
+        stale = {"status": "running", "started_at": {"$lt": cutoff}}
+        await self.collection.update_many(
+            {**stale, "attempts": {"$gte": GENERATION_JOB_MAX_ATTEMPTS}},
+            {"$set": {"status": "failed", "error": "Job did not finish", "finished_at": datetime.now(timezone.utc)}}
+        )
+        result = await self.collection.update_many(stale, {"$set": {"status": "queued"}})
+        return result.modified_count
+
+    async def _finish(self, job_id: str, update: Dict):
+        await self.collection.update_one(
+            {"id": job_id, "status": "running"},
+            {"$set": {**update, "finished_at": datetime.now(timezone.utc)}}
+        )
+
+    async def _worker(self):
+        while True:
+            # Cleared before claiming, so a submission made while this worker looks for work is not missed
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Failed to claim a generation job: {str(e)}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), GENERATION_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    try:
+                        await self.requeue_stale()
+                    except Exception as e:
+                        logging.error(f"Failed to requeue stale generation jobs: {str(e)}")
+                continue
+
+            try:
+                result_id = await self.run_job(job)
+                await self._finish(job["id"], {"status": "completed", "result_id": result_id, "error": None})
+            except asyncio.CancelledError:
+                # Shutting down: leave the job for the next start to pick up
+                await asyncio.shield(self.collection.update_one(
+                    {"id": job["id"], "status": "running"}, {"$set": {"status": "queued"}}
+                ))
+                raise
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                logging.error(f"Generation job {job['id']} failed: {detail}")
+                await self._finish(job["id"], {"status": "failed", "error": detail})
+
+    async def start(self):
+        """Recover jobs interrupted by the last shutdown, then start the workers"""
+        if self._tasks:
+            return
+        requeued = await self.requeue_stale()
+        if requeued:
+            logging.info(f"Requeued {requeued} interrupted generation jobs")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -0,0 +1,103 @@
+import hashlib
+import logging
+from typing import Dict, List, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Query parameters that only carry tracking data and never change the page
+TRACKING_PARAMS = frozenset(["fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "ncid"])
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+def normalize_url(url: str) -> str:
+    """Normalize an article URL so trivially different links compare equal"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+def url_hash(url: str) -> str:
+    """Stable hash of the normalized URL, used as the article dedup key"""
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+
+async def find_existing_hashes(collection, hashes: List[str]) -> Set[str]:
+    """Return the subset of hashes already stored (directly or as a linked near-duplicate), in a single round trip"""
+    if not hashes:
+        return set()
+    docs = await collection.find(
+        {"$or": [{"url_hash": {"$in": hashes}}, {"duplicate_url_hashes": {"$in": hashes}}]},
+        {"url_hash": 1, "duplicate_url_hashes": 1, "_id": 0}
+    ).to_list(None)
+
+    wanted = set(hashes)
+    existing = set()
+    for doc in docs:
+        existing.update(wanted.intersection([doc.get("url_hash")] + doc.get("duplicate_url_hashes", [])))
+    return existing
+
+async def insert_new_articles(collection, docs: List[Dict]) -> int:
+    """Upsert article documents keyed by url_hash in one unordered bulk write, returning the number inserted"""
+    if not docs:
+        return 0
+
+    operations = [
+        UpdateOne({"url_hash": doc["url_hash"]}, {"$setOnInsert": doc}, upsert=True)
+        for doc in docs
+    ]
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.upserted_count
+    except BulkWriteError as e:
+        # Concurrent runs racing on the same URL hit the unique index; the other writer already inserted it
+        duplicate_errors = [err for err in e.details.get("writeErrors", []) if err.get("code") == 11000]
+        if len(duplicate_errors) != len(e.details.get("writeErrors", [])):
+            raise
+        return e.details.get("nUpserted", 0)
+
+async def link_duplicates(collection, links: List[Dict]):
+    """Attach near-duplicate URLs and sources to their canonical articles in one bulk write"""
+    if not links:
+        return
+    operations = [
+        UpdateOne(
+            {"id": link["canonical_id"]},
+            {"$addToSet": {"duplicate_url_hashes": link["url_hash"], "duplicate_sources": link["source"]}}
+        )
+        for link in links
+    ]
+    await collection.bulk_write(operations, ordered=False)
+
+async def backfill_url_hashes(collection) -> int:
+    """Add url_hash to articles stored before hashes existed"""
+    docs = await collection.find({"url_hash": {"$exists": False}}, {"_id": 1, "url": 1}).to_list(None)
+    if not docs:
+        return 0
+
+    seen = set()
+    operations = []
+    for doc in docs:
+        digest = url_hash(doc.get("url", ""))
+        # Older duplicate rows keep no hash rather than violating the unique index
+        if digest in seen:
+            continue
+        seen.add(digest)
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"url_hash": digest}}))
+
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.modified_count
+    except BulkWriteError as e:
+        logging.warning(f"Skipped {len(e.details.get('writeErrors', []))} duplicate articles during url_hash backfill")
+        return e.details.get("nModified", 0)
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+# Key pool configuration
+KEY_POOL_REFRESH_SECONDS = int(os.environ.get("KEY_POOL_REFRESH_SECONDS", "60"))
+# Requests reserved per round trip; unused reservations go back to Mongo on shutdown
+KEY_POOL_LEASE_SIZE = int(os.environ.get("KEY_POOL_LEASE_SIZE", "10"))
+
+class _KeyState:
+    __slots__ = ("doc", "remaining", "exhausted", "lock")
+
+    def __init__(self, doc: Dict, remaining: int = 0):
+        self.doc = doc
+        self.remaining = remaining
+        self.exhausted = False
+        self.lock = asyncio.Lock()
+
+class KeyPool:
+    """Active API keys cached in memory, with daily quota reserved from Mongo in leases
+
+    A lease atomically adds up to KEY_POOL_LEASE_SIZE to a key's current_usage, never past its
+    max_requests_per_day, so processes sharing the keys can never hand out more requests than a
+    key allows. Requests are then served from the local lease without touching Mongo; current_usage
+    therefore counts reserved requests and runs at most one lease ahead per process.
+    """
+
+    def __init__(self, keys_collection, refresh_seconds: int = KEY_POOL_REFRESH_SECONDS,
+                 lease_size: int = KEY_POOL_LEASE_SIZE):
+        self.collection = keys_collection
+        self.refresh_seconds = refresh_seconds
+        self.lease_size = lease_size
+        self._states: Dict[str, _KeyState] = {}
+        self._ordered: List[_KeyState] = []
+        self._by_provider: Dict[str, List[_KeyState]] = {}
+        self._loaded_at: Optional[float] = None
+        self._load_lock = asyncio.Lock()
+
+    def invalidate(self):
+        """Reload the keys on the next request (after admin edits)"""
+        self._loaded_at = None
+
+    def reset(self):
+        """Forget every lease, for when the daily usage counters have been reset in Mongo"""
+        for state in self._states.values():
+            state.remaining = 0
+        self.invalidate()
+
+    async def _ensure_loaded(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        async with self._load_lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return
+            docs = await self.collection.find({"is_active": True}, {"_id": 0}).sort(
+                [("priority", -1), ("current_usage", 1)]
+            ).to_list(None)
+            # Leases survive a reload; keys that were deactivated or deleted lose theirs
+            states = {doc["id"]: _KeyState(doc, self._states[doc["id"]].remaining if doc["id"] in self._states else 0)
+                      for doc in docs}
+            by_provider: Dict[str, List[_KeyState]] = {}
+            for doc in docs:
+                by_provider.setdefault(doc["provider"], []).append(states[doc["id"]])
+            self._states, self._by_provider = states, by_provider
+            self._ordered = [states[doc["id"]] for doc in docs]
+            self._loaded_at = time.monotonic()
+
+    async def _lease(self, state: _KeyState) -> bool:
+        """Reserve up to a lease of requests for a key in one atomic update; False once it is used up"""
+        async with state.lock:
+            if state.remaining > 0:
+                return True
+            if state.exhausted:
+                return False
+            before = await self.collection.find_one_and_update(
+                {"id": state.doc["id"], "is_active": True,
+                 "$expr": {"$lt": ["$current_usage", "$max_requests_per_day"]}},
+                [{"$set": {
+                    "current_usage": {"$min": ["$max_requests_per_day", {"$add": ["$current_usage", self.lease_size]}]},
+                    "last_used": datetime.now(timezone.utc),
+                }}],
+                projection={"_id": 0},
+                return_document=ReturnDocument.BEFORE,
+            )
+            if before is None:
+                state.exhausted = True
+                return False
+            granted = min(before["max_requests_per_day"], before["current_usage"] + self.lease_size) - before["current_usage"]
+            state.doc = before
+            state.remaining += granted
+            return granted > 0
+
+    async def acquire(self, provider: Optional[str] = None) -> Optional[Dict]:
+        """Reserve one request on the best key (of a provider): highest priority first, then least used"""
+        await self._ensure_loaded()
+        candidates = self._ordered if provider is None else self._by_provider.get(provider, [])
+        for state in candidates:
+            if state.remaining > 0 or await self._lease(state):
+                state.remaining -= 1
+                return state.doc
+        return None
+
+    def release(self, key_id: str):
+        """Give back a reservation whose request never reached the provider"""
+        state = self._states.get(key_id)
+        if state is not None:
+            state.remaining += 1
+
+    async def close(self):
+        """Return unused leases to Mongo so other processes can use them"""
+        for key_id, state in self._states.items():
+            if state.remaining <= 0:
+                continue
+            try:
+                await self.collection.update_one(
+                    {"id": key_id},
+                    [{"$set": {"current_usage": {"$max": [0, {"$subtract": ["$current_usage", state.remaining]}]}}}]
+                )
+                state.remaining = 0
+            except Exception as e:
+                logging.error(f"Failed to return unused requests of API key {key_id}: {str(e)}")
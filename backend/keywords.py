@@ -0,0 +1,72 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tagger import DEFAULT_TAXONOMY, TagMatcher
+from term_stats import TermStatsSnapshot
+from tokenizer import tokenize
+
+DEFAULT_MATCHER = TagMatcher(DEFAULT_TAXONOMY)
+
+def term_matrix(texts: List[str]) -> Tuple[Dict[str, int], np.ndarray, np.ndarray, np.ndarray]:
+    """Sparse CSR term-count matrix for a batch: (vocabulary, column indices, counts, row pointers)"""
+    vocabulary: Dict[str, int] = {}
+    indices: List[int] = []
+    counts: List[int] = []
+    indptr = [0]
+    for text in texts:
+        # Counter keeps first-occurrence order, which breaks score ties the same way for every call
+        for term, count in Counter(tokenize(text)).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+    return (
+        vocabulary,
+        np.asarray(indices, dtype=np.int64),
+        np.asarray(counts, dtype=np.float64),
+        np.asarray(indptr, dtype=np.int64),
+    )
+
+def extract_keywords_batch(texts: List[str], top_n: int = 10, stats: Optional[TermStatsSnapshot] = None) -> List[List[str]]:
+    """Top TF-IDF keywords for each text
+
+    Document frequencies come from the batch itself plus, when a corpus snapshot is given, the
+    whole corpus, so generic words rank low even in a one-article batch.
+    """
+    if not texts:
+        return []
+    vocabulary, indices, counts, indptr = term_matrix(texts)
+    if not len(indices):
+        return [[] for _ in texts]
+
+    terms = np.array(list(vocabulary), dtype=object)
+    n_docs = len(texts)
+    document_frequency = np.bincount(indices, minlength=len(vocabulary))
+    corpus_size = n_docs
+    if stats is not None and stats.documents:
+        document_frequency = document_frequency + np.fromiter(
+            (stats.document_frequency(term) for term in vocabulary), dtype=np.int64, count=len(vocabulary)
+        )
+        corpus_size += stats.documents
+    idf = np.log((1 + corpus_size) / (1 + document_frequency)) + 1.0
+    scores = counts * idf[indices]
+
+    # Sort every row by descending score in one pass, then keep each row's first top_n entries
+    row_lengths = np.diff(indptr)
+    rows = np.repeat(np.arange(n_docs), row_lengths)
+    order = np.lexsort((-scores, rows))
+    rank = np.arange(len(order)) - indptr[rows[order]]
+    keep = order[rank < top_n]
+
+    kept_rows = rows[keep]
+    kept_terms = terms[indices[keep]]
+    boundaries = np.searchsorted(kept_rows, np.arange(1, n_docs))
+    return [list(chunk) for chunk in np.split(kept_terms, boundaries)]
+
+def extract_keywords_and_tags_batch(texts: List[str], matcher: Optional[TagMatcher] = None,
+                                    stats: Optional[TermStatsSnapshot] = None) -> List[Tuple[List[str], List[str]]]:
+    """Keywords and tags for a batch of texts in one call"""
+    matcher = matcher or DEFAULT_MATCHER
+    keywords = extract_keywords_batch(texts, stats=stats)
+    return [(keywords[i], matcher.tag(text)) for i, text in enumerate(texts)]
@@ -0,0 +1,27 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Dict
+
+# Concurrent LLM calls allowed per provider and per API key, across all generation endpoints
+LLM_PROVIDER_CONCURRENCY = int(os.environ.get("LLM_PROVIDER_CONCURRENCY", "8"))
+LLM_KEY_CONCURRENCY = int(os.environ.get("LLM_KEY_CONCURRENCY", "4"))
+
+class LLMConcurrencyLimits:
+    """Per-provider and per-key semaphores, so a burst of generations cannot exceed provider rate limits"""
+
+    def __init__(self, per_provider: int = LLM_PROVIDER_CONCURRENCY, per_key: int = LLM_KEY_CONCURRENCY):
+        self.per_provider = per_provider
+        self.per_key = per_key
+        self._providers: Dict[str, asyncio.Semaphore] = {}
+        self._keys: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, provider: str, key_id: str):
+        """Hold one provider slot and one key slot for the duration of a call"""
+        provider_limit = self._providers.setdefault(provider, asyncio.Semaphore(self.per_provider))
+        key_limit = self._keys.setdefault(key_id, asyncio.Semaphore(self.per_key))
+        # Always provider first, then key, so two calls never wait on each other's slots
+        async with provider_limit:
+            async with key_limit:
+                yield
@@ -0,0 +1,30 @@
+from typing import AsyncIterator
+
+try:
+    import litellm
+    HAS_LITELLM = True
+except ImportError:  # Streaming falls back to one chunk per response without litellm
+    HAS_LITELLM = False
+
+# litellm model prefixes for the providers stored on API keys
+LITELLM_PROVIDERS = {"gemini": "gemini", "openai": "openai", "anthropic": "anthropic"}
+STREAM_TIMEOUT = 300
+
+async def stream_completion(provider: str, model: str, api_key: str, system_message: str, prompt: str) -> AsyncIterator[str]:
+    """Yield the text deltas of a streamed chat completion"""
+    response = await litellm.acompletion(
+        model=f"{LITELLM_PROVIDERS[provider]}/{model}",
+        api_key=api_key,
+        messages=[
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt},
+        ],
+        stream=True,
+        timeout=STREAM_TIMEOUT,
+    )
+    async for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from bson import Binary
+
+# Near-duplicate configuration
+# Estimated Jaccard similarity of word-bigram sets at which two articles count as the same story.
+# On title + summary pairs, syndicated copies with an appended sentence or a reworded title score
+# 0.7-0.9, while different stories sharing a boilerplate paragraph stay under 0.3.
+NEAR_DUP_MIN_SIMILARITY = float(os.environ.get("NEAR_DUP_MIN_SIMILARITY", "0.5"))
+NEAR_DUP_WINDOW_DAYS = int(os.environ.get("NEAR_DUP_WINDOW_DAYS", "3"))
+SHINGLE_WORDS = 2
+MINHASH_PERMUTATIONS = 96
+# 32 bands of 3 rows: pairs at the similarity threshold share a band with ~99% probability
+LSH_BANDS = 32
+BAND_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+MINHASH_SEED = 1729
+MIN_TOKENS = 8  # Shorter texts produce noisy signatures and are not checked
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_rng = np.random.default_rng(MINHASH_SEED)
+# Multiply-shift hash family: (a * x + b) mod 2^64, top 32 bits; odd multipliers keep it universal
+_MULTIPLIERS = _rng.integers(1, 2 ** 63, size=MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_INCREMENTS = _rng.integers(0, 2 ** 63, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+def shingles(text: str) -> set:
+    """Overlapping word n-grams of the lowercased text"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    return {" ".join(tokens[i:i + SHINGLE_WORDS]) for i in range(len(tokens) - SHINGLE_WORDS + 1)}
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of the text's word shingles, or None when the text is too short to fingerprint"""
+    if len(TOKEN_PATTERN.findall(text)) < MIN_TOKENS:
+        return None
+    values = np.array([
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for shingle in shingles(text)
+    ], dtype=np.uint64)
+    hashed = (values[None, :] * _MULTIPLIERS[:, None] + _INCREMENTS[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+def lsh_bands(signature: np.ndarray) -> List[str]:
+    """Band keys used to find candidate near-duplicates with an exact-match index lookup"""
+    return [f"m{band}:{signature[band * BAND_ROWS:(band + 1) * BAND_ROWS].tobytes().hex()}" for band in range(LSH_BANDS)]
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.count_nonzero(a == b)) / MINHASH_PERMUTATIONS
+
+class NearDuplicateIndex:
+    """MinHash signatures of recent articles, stored in Mongo with LSH band keys"""
+
+    def __init__(self, fingerprints_collection):
+        self.fingerprints = fingerprints_collection
+
+    async def ensure_indexes(self):
+        await self.fingerprints.create_index("bands")
+        # Fingerprints only need to cover the recent window; older ones expire on their own
+        await self.fingerprints.create_index("created_at", expireAfterSeconds=NEAR_DUP_WINDOW_DAYS * 86400)
+
+    async def find_canonicals(self, candidates: List[Tuple[str, np.ndarray]]) -> Dict[str, str]:
+        """Map candidate article ids to the article id they near-duplicate, with one lookup for the batch
+
+        Candidates are (article_id, signature) pairs in feed order; a later candidate may also
+        match an earlier one from the same batch.
+        """
+        if not candidates:
+            return {}
+
+        all_bands = sorted({band for _, signature in candidates for band in lsh_bands(signature)})
+        cutoff = datetime.now(timezone.utc) - timedelta(days=NEAR_DUP_WINDOW_DAYS)
+        stored = await self.fingerprints.find(
+            {"bands": {"$in": all_bands}, "created_at": {"$gte": cutoff}},
+            {"_id": 0, "article_id": 1, "minhash": 1, "bands": 1}
+        ).to_list(None)
+
+        # Bucket known signatures by band so each candidate only compares against its collisions
+        buckets: Dict[str, List[Tuple[str, np.ndarray]]] = {}
+        for doc in stored:
+            entry = (doc["article_id"], np.frombuffer(doc["minhash"], dtype=np.uint32))
+            for band in doc["bands"]:
+                buckets.setdefault(band, []).append(entry)
+
+        canonicals = {}
+        for article_id, signature in candidates:
+            bands = lsh_bands(signature)
+            match = None
+            for band in bands:
+                for known_id, known_signature in buckets.get(band, []):
+                    if similarity(signature, known_signature) >= NEAR_DUP_MIN_SIMILARITY:
+                        match = known_id
+                        break
+                if match:
+                    break
+
+            if match:
+                canonicals[article_id] = match
+            else:
+                # A canonical in this batch can absorb later items from the same batch
+                for band in bands:
+                    buckets.setdefault(band, []).append((article_id, signature))
+        return canonicals
+
+    async def add(self, entries: List[Tuple[str, np.ndarray]]):
+        """Store signatures for newly inserted canonical articles"""
+        if not entries:
+            return
+        now = datetime.now(timezone.utc)
+        await self.fingerprints.insert_many([
+            {"article_id": article_id, "minhash": Binary(signature.tobytes()), "bands": lsh_bands(signature), "created_at": now}
+            for article_id, signature in entries
+        ], ordered=False)
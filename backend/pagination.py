@@ -0,0 +1,48 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Keyset pagination configuration
+PAGE_MAX_LIMIT = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Newest first; id breaks ties between documents created in the same instant
+PAGE_SORT = [("created_at", -1), ("id", -1)]
+
+def encode_cursor(doc: Dict) -> str:
+    """Opaque cursor pointing just past a document in (created_at, id) order"""
+    created_at = doc["created_at"]
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    payload = json.dumps([created_at.isoformat(), doc["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """(created_at, id) of a cursor; raises ValueError when it was not produced by encode_cursor"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, doc_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), str(doc_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+def keyset_query(query: Dict, cursor: Optional[str]) -> Dict:
+    """Add the "strictly after the cursor" condition to a listing query"""
+    if not cursor:
+        return query
+    created_at, doc_id = decode_cursor(cursor)
+    after = {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": doc_id}},
+    ]}
+    return {"$and": [query, after]} if query else after
+
+async def fetch_page(collection, query: Dict, limit: int, cursor: Optional[str] = None,
+                     projection: Optional[Dict] = None) -> Tuple[List[Dict], Optional[str]]:
+    """One page of documents newest first, plus the cursor of the next page (None on the last page)"""
+    limit = max(1, min(limit, PAGE_MAX_LIMIT))
+    docs = await collection.find(keyset_query(query, cursor), projection).sort(PAGE_SORT).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_cursor(docs[-1])
+    return docs, None
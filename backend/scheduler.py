@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+# Scheduler configuration (intervals in seconds)
+FEED_SCHEDULER_ENABLED = os.environ.get("FEED_SCHEDULER_ENABLED", "true").lower() == "true"
+FEED_POLL_MIN_INTERVAL = int(os.environ.get("FEED_POLL_MIN_INTERVAL", "300"))
+FEED_POLL_MAX_INTERVAL = int(os.environ.get("FEED_POLL_MAX_INTERVAL", "21600"))
+FEED_POLL_DEFAULT_INTERVAL = int(os.environ.get("FEED_POLL_DEFAULT_INTERVAL", "1800"))
+FEED_SCHEDULER_TICK = int(os.environ.get("FEED_SCHEDULER_TICK", "30"))
+POLL_JITTER = 0.1  # +/- 10% so feeds spread out instead of polling in lockstep
+
+def next_poll_schedule(feed: Dict, new_articles: int, now: Optional[datetime] = None) -> Dict:
+    """Adapt a feed's poll interval to how much it published since the last poll"""
+    now = now or datetime.now(timezone.utc)
+    interval = feed.get("poll_interval") or FEED_POLL_DEFAULT_INTERVAL
+
+    if new_articles == 0:
+        interval *= 1.5  # Quiet feed: back off
+    elif new_articles >= 5:
+        interval *= 0.5  # Busy feed: tighten so items are not missed between polls
+    elif new_articles >= 2:
+        interval *= 0.8
+
+    interval = int(min(FEED_POLL_MAX_INTERVAL, max(FEED_POLL_MIN_INTERVAL, interval)))
+    jittered = interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+    return {
+        "poll_interval": interval,
+        "next_fetch_at": now + timedelta(seconds=jittered),
+    }
+
+class FeedScheduler:
+    """Background loop that polls each active feed when its next_fetch_at comes due"""
+
+    def __init__(self, feeds_collection, poll: Callable[[Dict], Awaitable], tick: int = FEED_SCHEDULER_TICK):
+        self.feeds = feeds_collection
+        self.poll = poll
+        self.tick = tick
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Set[str] = set()
+        self._poll_tasks: Set[asyncio.Task] = set()
+
+    def start(self):
+        """Start the scheduler loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the loop and any polls still running"""
+        tasks = list(self._poll_tasks)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Feed scheduler tick failed: {str(e)}")
+            await asyncio.sleep(self.tick)
+
+    async def run_due(self) -> int:
+        """Start polls for every feed that is due and not already being polled"""
+        now = datetime.now(timezone.utc)
+        due = await self.feeds.find({
+            "is_active": True,
+            "id": {"$nin": list(self._in_flight)},
+            "$or": [{"next_fetch_at": {"$lte": now}}, {"next_fetch_at": None}]
+        }).to_list(1000)
+
+        for feed in due:
+            self._in_flight.add(feed["id"])
+            task = asyncio.create_task(self._poll_feed(feed))
+            self._poll_tasks.add(task)
+            task.add_done_callback(self._poll_tasks.discard)
+        return len(due)
+
+    async def _poll_feed(self, feed: Dict):
+        try:
+            await self.poll(feed)
+        except Exception as e:
+            logging.error(f"Scheduled poll of {feed.get('url')} failed: {str(e)}")
+            # Push the feed back so a persistent error is not retried on every tick
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=FEED_POLL_MIN_INTERVAL)
+            await self.feeds.update_one({"id": feed["id"]}, {"$set": {"next_fetch_at": retry_at}})
+        finally:
+            self._in_flight.discard(feed["id"])
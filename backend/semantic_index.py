@@ -0,0 +1,318 @@
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from bson import Binary
+from pymongo import UpdateOne
+
+from bm25_index import KINDS, document_text
+from tokenizer import STOPWORDS, normalize_token
+
+# Semantic index configuration
+SEMANTIC_SEARCH_ENABLED = os.environ.get("SEMANTIC_SEARCH_ENABLED", "true").lower() == "true"
+# Below this many documents every query is a brute-force dot product; above it, IVF partitions are trained
+SEMANTIC_IVF_MIN_DOCUMENTS = int(os.environ.get("SEMANTIC_IVF_MIN_DOCUMENTS", "50000"))
+SEMANTIC_NPROBE = int(os.environ.get("SEMANTIC_NPROBE", "8"))
+SEMANTIC_MIN_SCORE = float(os.environ.get("SEMANTIC_MIN_SCORE", "0.1"))
+# The projection adds noise with a standard deviation of about 1/sqrt(EMBEDDING_DIMENSIONS), so
+# unrelated documents reach 0.2 on short queries. Sources for generation are therefore confirmed by
+# the exact cosine of the unprojected features: unrelated word salad stays under 0.13 there, while
+# articles actually about the query score 0.2 and up.
+SEMANTIC_MATCH_SCORE = float(os.environ.get("SEMANTIC_MATCH_SCORE", "0.15"))
+# Nearest documents by embedding that are confirmed against SEMANTIC_MATCH_SCORE
+SEMANTIC_MATCH_CANDIDATES = int(os.environ.get("SEMANTIC_MATCH_CANDIDATES", "50"))
+HASH_BUCKETS = 2 ** 14
+EMBEDDING_DIMENSIONS = 256
+PROJECTION_SEED = 1729
+EMBED_BATCH_SIZE = 500
+# Partitions are retrained once the documents added since the last training reach this share of the index
+IVF_RETRAIN_RATIO = 0.5
+CATCH_UP_SLACK_SECONDS = 300
+# Bumped whenever the features change; stored embeddings of another version are recomputed
+EMBEDDING_VERSION = 2
+# Whole words of any length (so "AI" or "GPU" count) with Indic matras and viramas kept inside the word
+EMBEDDING_WORD_PATTERN = re.compile(r"[\u0900-\u0963\u0970-\u097f]+|[\u0980-\u09e5\u09f0-\u09ff]+|[^\W_]+")
+# Short English function words the keyword stopwords leave out because the tokenizer never sees them
+EMBEDDING_STOPWORDS = STOPWORDS | frozenset([
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'at', 'by', 'for', 'as', 'is', 'are', 'was', 'be',
+    'it', 'its', 'we', 'you', 'he', 'she', 'his', 'her', 'our', 'not', 'but', 'has', 'had', 'can', 'how'
+])
+CHAR_NGRAM_SIZE = 3
+# Character n-grams match inflections and acronyms inside longer words, but words should dominate
+CHAR_NGRAM_WEIGHT = 0.5
+
+@lru_cache(maxsize=1)
+def _projection() -> np.ndarray:
+    # Fixed Gaussian random projection from the hashed feature space; the seed makes every process agree
+    rng = np.random.default_rng(PROJECTION_SEED)
+    return (rng.standard_normal((HASH_BUCKETS, EMBEDDING_DIMENSIONS)) / math.sqrt(EMBEDDING_DIMENSIONS)).astype(np.float32)
+
+@lru_cache(maxsize=262144)
+def _feature_slot(feature: str) -> Tuple[int, float]:
+    """Hashed bucket and sign of a feature (the signed hashing trick keeps collisions unbiased)"""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+    return digest % HASH_BUCKETS, (1.0 if digest >> 63 else -1.0)
+
+def _embedding_word(word: str) -> str:
+    word = normalize_token(word)
+    # English plurals fold onto the singular so "LLMs" matches "LLM"
+    if word.isascii() and len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def _features(text: str) -> Counter:
+    """Words, word bigrams and character n-grams of the padded words ("#"-prefixed)"""
+    words = [_embedding_word(word) for word in EMBEDDING_WORD_PATTERN.findall(unicodedata.normalize("NFC", text.lower()))]
+    words = [word for word in words if word not in EMBEDDING_STOPWORDS]
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f"<{word}>"
+        features.update(f"#{padded[i:i + CHAR_NGRAM_SIZE]}" for i in range(len(padded) - CHAR_NGRAM_SIZE + 1))
+    return features
+
+def _weighted_features(text: str) -> Dict[str, float]:
+    """Sublinear-tf weights of the features, with character n-grams down-weighted"""
+    return {
+        feature: (1.0 + math.log(count)) * (CHAR_NGRAM_WEIGHT if feature[0] == "#" else 1.0)
+        for feature, count in _features(text).items()
+    }
+
+def exact_similarities(query: str, texts: List[str]) -> List[float]:
+    """Cosine similarity of the query to each text over the unprojected features, free of projection noise"""
+    query_weights = _weighted_features(query)
+    query_norm = math.sqrt(sum(weight * weight for weight in query_weights.values()))
+    similarities = []
+    for text in texts:
+        weights = _weighted_features(text)
+        norm = query_norm * math.sqrt(sum(weight * weight for weight in weights.values()))
+        dot = sum(weight * weights.get(feature, 0.0) for feature, weight in query_weights.items())
+        similarities.append(dot / norm if norm else 0.0)
+    return similarities
+
+def confirm_matches(query: str, docs: List[Dict], limit: int) -> List[Dict]:
+    """The documents whose exact similarity to the query reaches SEMANTIC_MATCH_SCORE, best first"""
+    scores = exact_similarities(query, [document_text(doc) for doc in docs])
+    confirmed = [(score, i) for i, score in enumerate(scores) if score >= SEMANTIC_MATCH_SCORE]
+    confirmed.sort(key=lambda item: (-item[0], item[1]))
+    return [docs[i] for _, i in confirmed[:limit]]
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Unit-length embeddings: sublinear-tf hashed words, bigrams and character n-grams through a random projection"""
+    projection = _projection()
+    embeddings = np.zeros((len(texts), EMBEDDING_DIMENSIONS), dtype=np.float32)
+    for row, text in enumerate(texts):
+        features = _weighted_features(text)
+        if not features:
+            continue
+        slots = np.empty(len(features), dtype=np.int64)
+        weights = np.empty(len(features), dtype=np.float32)
+        for i, (feature, weight) in enumerate(features.items()):
+            slots[i], sign = _feature_slot(feature)
+            weights[i] = sign * weight
+        embeddings[row] = weights @ projection[slots]
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+def train_ivf(vectors: np.ndarray, iterations: int = 10) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Spherical k-means partitions: (centroids, document numbers grouped by partition, partition offsets)"""
+    n_lists = int(min(4096, max(16, math.sqrt(len(vectors)))))
+    rng = np.random.default_rng(PROJECTION_SEED)
+    sample = vectors[rng.choice(len(vectors), size=min(len(vectors), 64 * n_lists), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty partitions keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+    assignment = np.concatenate([
+        np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), 65536)
+    ])
+    order = np.argsort(assignment, kind="stable")
+    offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+    return centroids, order, offsets
+
+class SemanticIndex:
+    """Embeddings of articles and generated content in a NumPy matrix, persisted in Mongo
+
+    Queries are a single matrix-vector product while the index is small. Past
+    SEMANTIC_IVF_MIN_DOCUMENTS, k-means partitions are trained in a worker thread and a query scores
+    only the documents of its SEMANTIC_NPROBE nearest partitions plus those added since training.
+    """
+
+    def __init__(self, embeddings_collection):
+        self.collection = embeddings_collection
+        self.ready = False
+        self.doc_ids: List[str] = []
+        self._docnos: Dict[str, int] = {}
+        self._vectors = np.zeros((1024, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        self._kinds = np.zeros(1024, dtype=np.uint8)
+        # IVF state: only the first _trained documents are partitioned
+        self._centroids: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._trained = 0
+        self._training: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("created_at")
+        await self.collection.create_index("version")
+
+    def add(self, kind: str, doc_id: str, vector: np.ndarray) -> bool:
+        if doc_id in self._docnos:
+            return False
+        docno = len(self.doc_ids)
+        if docno == len(self._vectors):
+            self._vectors = np.concatenate((self._vectors, np.zeros_like(self._vectors)))
+            self._kinds = np.concatenate((self._kinds, np.zeros_like(self._kinds)))
+        self._vectors[docno] = vector
+        self._kinds[docno] = KINDS.index(kind)
+        self.doc_ids.append(doc_id)
+        self._docnos[doc_id] = docno
+        return True
+
+    async def add_documents(self, kind: str, docs: Iterable[Dict]) -> int:
+        """Embed newly written documents, store the embeddings and add them to the index"""
+        # Documents written while the index builds are added too; only a disabled index ignores them
+        if self._task is None:
+            return 0
+        docs = [doc for doc in docs if doc["id"] not in self._docnos]
+        if not docs:
+            return 0
+        vectors = await asyncio.to_thread(embed_texts, [document_text(doc) for doc in docs])
+        await self.collection.bulk_write([
+            UpdateOne(
+                {"_id": doc["id"]},
+                {"$set": {
+                    "kind": kind,
+                    "vector": Binary(vector.astype(np.float16).tobytes()),
+                    "version": EMBEDDING_VERSION,
+                    "created_at": doc.get("created_at") or datetime.now(timezone.utc),
+                }},
+                upsert=True,
+            )
+            for doc, vector in zip(docs, vectors)
+        ], ordered=False)
+        added = sum(self.add(kind, doc["id"], vector) for doc, vector in zip(docs, vectors))
+        self._maybe_train()
+        return added
+
+    def _maybe_train(self):
+        n_docs = len(self.doc_ids)
+        if n_docs < SEMANTIC_IVF_MIN_DOCUMENTS or (self._training is not None and not self._training.done()):
+            return
+        if self._centroids is None or n_docs - self._trained >= IVF_RETRAIN_RATIO * self._trained:
+            self._training = asyncio.create_task(self._train())
+
+    async def _train(self):
+        n_docs = len(self.doc_ids)
+        # Rows below n_docs never change, so the worker thread can read this view while adds continue
+        vectors = self._vectors[:n_docs]
+        try:
+            centroids, order, offsets = await asyncio.to_thread(train_ivf, vectors)
+        except Exception as e:
+            logging.error(f"Semantic index partition training failed: {str(e)}")
+            return
+        self._centroids, self._order, self._offsets, self._trained = centroids, order, offsets, n_docs
+        logging.info(f"Semantic index partitioned {n_docs} documents into {len(centroids)} lists")
+
+    def search_vector(self, vector: np.ndarray, limit: int = 10, kind: Optional[str] = None) -> List[Tuple[str, float]]:
+        """(document id, cosine similarity) pairs for the nearest documents, optionally of one kind"""
+        n_docs = len(self.doc_ids)
+        if not n_docs or limit <= 0 or not vector.any():
+            return []
+        if self._centroids is None:
+            docnos = np.arange(n_docs)
+            scores = self._vectors[:n_docs] @ vector
+        else:
+            probes = np.argsort(-(self._centroids @ vector))[:SEMANTIC_NPROBE]
+            docnos = np.concatenate(
+                [self._order[self._offsets[p]:self._offsets[p + 1]] for p in probes] + [np.arange(self._trained, n_docs)]
+            )
+            scores = self._vectors[docnos] @ vector
+
+        keep = scores >= SEMANTIC_MIN_SCORE
+        if kind is not None:
+            keep &= self._kinds[docnos] == KINDS.index(kind)
+        docnos, scores = docnos[keep], scores[keep]
+        if len(docnos) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            docnos, scores = docnos[top], scores[top]
+        ranked = np.lexsort((-docnos, -scores))
+        return [(self.doc_ids[docnos[i]], float(scores[i])) for i in ranked]
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Tuple[str, float]]:
+        return self.search_vector(embed_texts([query])[0], limit, kind)
+
+    async def _load(self) -> Optional[datetime]:
+        """Load every stored embedding of the current version into the matrix; returns the newest created_at"""
+        latest = None
+        cursor = self.collection.find(
+            {"version": EMBEDDING_VERSION}, {"kind": 1, "vector": 1, "created_at": 1}
+        ).sort("created_at", 1)
+        async for doc in cursor:
+            vector = np.frombuffer(doc["vector"], dtype=np.float16).astype(np.float32)
+            self.add(doc["kind"], doc["_id"], vector)
+            latest = doc.get("created_at") or latest
+        return latest
+
+    async def _catch_up(self, kind: str, collection, since: Optional[datetime]) -> int:
+        """Embed documents that have no stored embedding yet (all of them on first start)"""
+        query = {"created_at": {"$gte": since}} if since else {}
+        projection = {"_id": 0, "id": 1, "title": 1, "summary": 1, "content": 1, "created_at": 1}
+        added = 0
+        batch = []
+        async for doc in collection.find(query, projection).sort("created_at", 1):
+            if doc["id"] not in self._docnos:
+                batch.append(doc)
+            if len(batch) >= EMBED_BATCH_SIZE:
+                added += await self.add_documents(kind, batch)
+                batch = []
+        if batch:
+            added += await self.add_documents(kind, batch)
+        return added
+
+    async def build(self, articles_collection, content_collection):
+        """Load stored embeddings, then embed whatever was written since; searches wait until it finishes"""
+        latest = await self._load()
+        since = None
+        # Embeddings of an older version are recomputed, which needs a scan of every document
+        outdated = await self.collection.count_documents({"version": {"$ne": EMBEDDING_VERSION}}, limit=1)
+        if latest is not None and not outdated:
+            latest = latest if latest.tzinfo else latest.replace(tzinfo=timezone.utc)
+            since = datetime.fromtimestamp(latest.timestamp() - CATCH_UP_SLACK_SECONDS, tz=timezone.utc)
+        added = await self._catch_up("articles", articles_collection, since)
+        added += await self._catch_up("content", content_collection, since)
+        self.ready = True
+        logging.info(f"Semantic index ready: {len(self.doc_ids)} documents ({added} newly embedded)")
+        self._maybe_train()
+
+    def start(self, articles_collection, content_collection):
+        if self._task is None:
+            self._task = asyncio.create_task(self.build(articles_collection, content_collection))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._training is not None:
+            self._training.cancel()
+            await asyncio.gather(self._training, return_exceptions=True)
+            self._training = None
@@ -1,22 +1,43 @@
-from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, Depends, Response, status
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Union
 import uuid
+import hashlib
 from datetime import datetime, timezone, timedelta
-import feedparser
-import requests
-from bs4 import BeautifulSoup
 import asyncio
-import re
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 import json
 from auth import *
+from feed_fetcher import FeedFetcher
+from feed_parser import FeedParserPool
+from content_extractor import ArticleExtractor, ARTICLE_EXTRACTION_ENABLED
+from collection_jobs import CollectionRun, CollectionRunRegistry, format_sse
+from circuit_breaker import breaker_allows, breaker_update
+from scheduler import FeedScheduler, next_poll_schedule, FEED_SCHEDULER_ENABLED
+from ingestion import url_hash, find_existing_hashes, insert_new_articles, link_duplicates, backfill_url_hashes
+from near_duplicates import NearDuplicateIndex, minhash
+from keywords import extract_keywords_and_tags_batch
+from tagger import TaxonomyStore
+from term_stats import TermStatistics
+from trending import TrendingSketches, TREND_WINDOWS
+from tokenizer import normalize_token
+from text_search import text_search, ensure_text_index, ARTICLE_TEXT_WEIGHTS, CONTENT_TEXT_WEIGHTS
+from bm25_index import BM25Index, BM25_SEARCH_ENABLED
+from semantic_index import SemanticIndex, SEMANTIC_MATCH_CANDIDATES, SEMANTIC_SEARCH_ENABLED, confirm_matches
+from pagination import fetch_page, NEXT_CURSOR_HEADER
+from suggest import SuggestIndex
+from generation_cache import GenerationCache, generation_cache_key
+from generation_jobs import GenerationJobQueue
+from llm_stream import stream_completion, HAS_LITELLM
+from llm_limits import LLMConcurrencyLimits
+from key_pool import KeyPool
 import random
 
 ROOT_DIR = Path(__file__).parent
@@ -27,6 +48,25 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
+# Shared HTTP pool for feed polling
+feed_fetcher = FeedFetcher()
+# Worker processes for feedparser and summary HTML stripping
+feed_parser_pool = FeedParserPool()
+# MinHash signatures of recent articles for cross-feed near-duplicate detection
+near_duplicate_index = NearDuplicateIndex(db.article_fingerprints)
+# Admin-editable tag taxonomy, compiled into an Aho-Corasick matcher
+taxonomy_store = TaxonomyStore(db.tag_taxonomy)
+# Corpus document frequencies for TF-IDF keyword ranking
+term_statistics = TermStatistics(db.term_stats)
+# Time-bucketed term sketches behind /api/trending
+trending_sketches = TrendingSketches(db.trend_buckets)
+search_index = BM25Index()
+semantic_index = SemanticIndex(db.article_embeddings)
+suggest_index = SuggestIndex()
+generation_cache = GenerationCache()
+llm_limits = LLMConcurrencyLimits()
+key_pool = KeyPool(db.api_keys)
+
 # Create the main app without a prefix
 app = FastAPI(title="TechPulse AI Admin", description="AI-powered RSS feed aggregation and content generation platform with admin controls")
 
@@ -69,6 +109,22 @@ class RSSFeed(BaseModel):
     language: str = "english"
     is_active: bool = True
     last_fetched: Optional[datetime] = None
+    # Conditional GET validators from the last successful fetch
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    # Adaptive polling state, persisted so a restart resumes the schedule
+    poll_interval: Optional[int] = None
+    next_fetch_at: Optional[datetime] = None
+    # Ingestion watermark: GUIDs at the head of the feed and the newest published time seen
+    last_entry_ids: List[str] = []
+    last_published_at: Optional[datetime] = None
+    # Circuit breaker: dead feeds are only retried with exponential backoff
+    circuit_state: str = "closed"
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+    last_failure_at: Optional[datetime] = None
+    retry_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class RSSFeedCreate(BaseModel):
@@ -83,6 +139,8 @@ class NewsArticle(BaseModel):
     summary: str
     content: str
     url: str
+    url_hash: Optional[str] = None  # Hash of the normalized URL, unique across articles
+    content_status: Optional[str] = None  # Full-text extraction state: extracted, empty, skipped, failed
     source: str
     category: str
     language: str
@@ -91,6 +149,9 @@ class NewsArticle(BaseModel):
     keywords: List[str] = []
     tags: List[str] = []
     seo_score: Optional[int] = None
+    # Near-duplicates from other feeds are folded into the canonical article instead of stored as rows
+    duplicate_url_hashes: List[str] = []
+    duplicate_sources: List[str] = []
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class GeneratedContent(BaseModel):
@@ -111,6 +172,36 @@ class GeneratedContent(BaseModel):
     api_key_used: Optional[str] = None  # Track which API key was used
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+# Card views: the fields a listing needs, without article bodies
+class NewsArticleCard(BaseModel):
+    id: str
+    title: str
+    summary: str
+    url: str
+    source: str
+    category: str
+    language: str
+    published_date: datetime
+    image_url: Optional[str] = None
+    tags: List[str] = []
+    seo_score: Optional[int] = None
+    created_at: datetime
+
+class GeneratedContentCard(BaseModel):
+    id: str
+    title: str
+    summary: str
+    language: str
+    tags: List[str] = []
+    seo_score: int = 100
+    tone: str = "professional"
+    word_count: int
+    is_published: bool = False
+    created_at: datetime
+
+def card_projection(model) -> Dict[str, int]:
+    return {"_id": 0, **{field: 1 for field in model.model_fields}}
+
 class ContentGenerationRequest(BaseModel):
     topics: List[str]
     language: str = "english"  # english, hindi, bangla
@@ -118,6 +209,13 @@ class ContentGenerationRequest(BaseModel):
     length: str = "medium"  # short, medium, long
     include_seo: bool = True
     article_count: int = 3  # Number of source articles to use
+    bypass_cache: bool = False  # Admins only: always call the model, even for a cached request
+
+class BatchGenerationRequest(BaseModel):
+    items: List[ContentGenerationRequest] = Field(..., min_length=1, max_length=20)
+
+class TaxonomyTermUpdate(BaseModel):
+    synonyms: List[str] = []
 
 class PublishRequest(BaseModel):
     content_id: str
@@ -156,31 +254,10 @@ DEFAULT_RSS_FEEDS = [
 
 # API Key Management Functions
 async def get_best_api_key(provider: str = None) -> Optional[APIKey]:
-    """Get the best available API key based on priority and usage"""
-    query = {"is_active": True}
-    if provider:
-        query["provider"] = provider
-    
-    # Get all active API keys sorted by priority (descending) and usage (ascending)
-    keys = await db.api_keys.find(query).sort([("priority", -1), ("current_usage", 1)]).to_list(100)
-    
-    for key_data in keys:
-        key = APIKey(**key_data)
-        # Check if key hasn't exceeded daily limit
-        if key.current_usage < key.max_requests_per_day:
-            return key
-    
-    return None
-
-async def increment_api_key_usage(api_key_id: str):
-    """Increment usage count for an API key"""
-    await db.api_keys.update_one(
-        {"id": api_key_id},
-        {
-            "$inc": {"current_usage": 1},
-            "$set": {"last_used": datetime.now(timezone.utc)}
-        }
-    )
+    """Get the best available API key based on priority and usage, reserving one request of its daily quota"""
+    # Served from the in-memory key pool; Mongo is only touched to lease more quota
+    key_data = await key_pool.acquire(provider)
+    return APIKey(**key_data) if key_data else None
 
 async def reset_daily_usage():
     """Reset daily usage for all API keys (should be called daily)"""
@@ -188,105 +265,128 @@ async def reset_daily_usage():
         {},
         {"$set": {"current_usage": 0}}
     )
+    key_pool.reset()
 
 # Initialize LLM Chat with failover
-async def get_llm_chat_with_failover(language: str = "english") -> tuple[LlmChat, str]:
-    """Get LLM Chat instance with automatic failover"""
-    system_messages = {
-        "english": "You are a professional tech news writer who creates engaging, SEO-optimized, human-like articles. Write in a conversational yet professional tone that is completely undetectable as AI-generated content. Focus on trending topics, insights, and practical implications.",
-        "hindi": "आप एक पेशेवर टेक न्यूज़ लेखक हैं जो आकर्षक, SEO-अनुकूलित, मानव-जैसे लेख बनाते हैं। एक बातचीत करने वाले लेकिन पेशेवर टोन में लिखें जो पूरी तरह से AI-जनरेटेड कंटेंट के रूप में पहचाना न जा सके।",
-        "bangla": "আপনি একজন পেশাদার টেক নিউজ লেখক যিনি আকর্ষণীয়, SEO-অপ্টিমাইজড, মানুষের মতো আর্টিকেল তৈরি করেন। কথোপকথনের কিন্তু পেশাদার টোনে লিখুন যা সম্পূর্ণভাবে AI-জেনারেটেড কন্টেন্ট হিসেবে সনাক্ত করা যায় না।"
-    }
-    
+SYSTEM_MESSAGES = {
+    "english": "You are a professional tech news writer who creates engaging, SEO-optimized, human-like articles. Write in a conversational yet professional tone that is completely undetectable as AI-generated content. Focus on trending topics, insights, and practical implications.",
+    "hindi": "आप एक पेशेवर टेक न्यूज़ लेखक हैं जो आकर्षक, SEO-अनुकूलित, मानव-जैसे लेख बनाते हैं। एक बातचीत करने वाले लेकिन पेशेवर टोन में लिखें जो पूरी तरह से AI-जनरेटेड कंटेंट के रूप में पहचाना न जा सके।",
+    "bangla": "আপনি একজন পেশাদার টেক নিউজ লেখক যিনি আকর্ষণীয়, SEO-অপ্টিমাইজড, মানুষের মতো আর্টিকেল তৈরি করেন। কথোপকথনের কিন্তু পেশাদার টোনে লিখুন যা সম্পূর্ণভাবে AI-জেনারেটেড কন্টেন্ট হিসেবে সনাক্ত করা যায় না।"
+}
+
+LLM_PROVIDERS = ["gemini", "openai", "anthropic"]
+
+async def get_llm_chat_with_failover(language: str = "english") -> tuple[LlmChat, str, str]:
+    """Get LLM Chat instance with automatic failover, with the id and provider of the key it uses"""
     # Try to get Gemini key first, then OpenAI, then Anthropic
-    for provider in ["gemini", "openai", "anthropic"]:
+    for provider in LLM_PROVIDERS:
         api_key = await get_best_api_key(provider)
         if api_key:
             try:
                 chat = LlmChat(
                     api_key=api_key.api_key,
                     session_id=f"techpulse_{language}_{datetime.now().timestamp()}",
-                    system_message=system_messages.get(language, system_messages["english"])
+                    system_message=SYSTEM_MESSAGES.get(language, SYSTEM_MESSAGES["english"])
                 ).with_model(provider, api_key.model)
                 
-                return chat, api_key.id
+                return chat, api_key.id, provider
             except Exception as e:
+                key_pool.release(api_key.id)
                 logging.error(f"Failed to initialize {provider} chat: {str(e)}")
                 continue
     
     # Fallback to Emergent LLM key
+    return emergent_llm_chat(language)
+
+def emergent_llm_chat(language: str = "english") -> tuple[LlmChat, str, str]:
+    """LLM Chat on the Emergent key, the last resort once the stored keys are used up or failing"""
     emergent_key = os.environ.get('EMERGENT_LLM_KEY')
     if emergent_key:
         chat = LlmChat(
             api_key=emergent_key,
             session_id=f"techpulse_{language}_{datetime.now().timestamp()}",
-            system_message=system_messages.get(language, system_messages["english"])
+            system_message=SYSTEM_MESSAGES.get(language, SYSTEM_MESSAGES["english"])
         ).with_model("gemini", "gemini-2.0-flash")
         
-        return chat, "emergent_fallback"
+        return chat, "emergent_fallback", "emergent"
     
     raise HTTPException(status_code=500, detail="No API keys available for content generation")
 
+async def stream_llm_text(language: str, prompt: str, used: Dict) -> AsyncIterator[str]:
+    """Stream the model's text with the same failover order; keys litellm cannot stream answer in one chunk
+
+    The id of the key that produced the text is left in used["api_key_id"].
+    """
+    system_message = SYSTEM_MESSAGES.get(language, SYSTEM_MESSAGES["english"])
+    if HAS_LITELLM:
+        for provider in LLM_PROVIDERS:
+            api_key = await get_best_api_key(provider)
+            if not api_key:
+                continue
+            started = False
+            try:
+                async with llm_limits.slot(provider, api_key.id):
+                    async for chunk in stream_completion(provider, api_key.model, api_key.api_key, system_message, prompt):
+                        started = True
+                        yield chunk
+                used["api_key_id"] = api_key.id
+                return
+            except Exception as e:
+                # Fail over only while nothing has been sent; a broken stream cannot be resumed elsewhere.
+                # The reservation is kept: the provider may have counted the request before failing.
+                if started:
+                    raise
+                logging.error(f"Failed to stream from {provider}: {str(e)}")
+    
+    # The Emergent key (and every key, without litellm) answers in a single chunk. With litellm every
+    # stored key was just tried and each kept its reservation, so only the Emergent key is left.
+    if HAS_LITELLM:
+        chat, api_key_used, provider = emergent_llm_chat(language)
+    else:
+        chat, api_key_used, provider = await get_llm_chat_with_failover(language)
+    async with llm_limits.slot(provider, api_key_used):
+        response = await chat.send_message(UserMessage(text=prompt))
+    used["api_key_id"] = api_key_used
+    yield response
+
 # Helper functions (same as before)
-async def fetch_rss_feed(url: str) -> List[Dict]:
-    """Fetch and parse RSS feed"""
+async def fetch_rss_feed(feed_doc: Dict) -> Dict:
+    """Fetch and parse RSS feed, skipping the parse when the feed has not changed"""
+    # Send the validators from the previous fetch so unchanged feeds answer 304
+    headers = {}
+    if feed_doc.get('etag'):
+        headers['If-None-Match'] = feed_doc['etag']
+    if feed_doc.get('last_modified'):
+        headers['If-Modified-Since'] = feed_doc['last_modified']
+    
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        response = await feed_fetcher.fetch(feed_doc['url'], headers=headers)
+        if response["status"] == 304:
+            return {"status": "not_modified", "articles": [], "validators": {}, "watermark": {}}
         
-        feed = feedparser.parse(response.content)
-        articles = []
+        # Servers without validators still get a cheap content hash comparison
+        validators = {
+            "etag": response["headers"].get("ETag"),
+            "last_modified": response["headers"].get("Last-Modified"),
+            "content_hash": hashlib.sha256(response["content"]).hexdigest()
+        }
+        if validators["content_hash"] == feed_doc.get('content_hash'):
+            return {"status": "unchanged", "articles": [], "validators": validators, "watermark": {}}
         
-        for entry in feed.entries[:10]:  # Limit to latest 10 articles
-            # Extract image from entry
-            image_url = None
-            if hasattr(entry, 'media_content') and entry.media_content:
-                image_url = entry.media_content[0].get('url')
-            elif hasattr(entry, 'enclosures') and entry.enclosures:
-                for enclosure in entry.enclosures:
-                    if enclosure.type.startswith('image/'):
-                        image_url = enclosure.href
-                        break
-            
-            # Clean summary
-            summary = entry.get('summary', entry.get('description', ''))
-            if summary:
-                soup = BeautifulSoup(summary, 'html.parser')
-                summary = soup.get_text().strip()[:500]
-            
-            articles.append({
-                'title': entry.get('title', '').strip(),
-                'summary': summary,
-                'url': entry.get('link', ''),
-                'published_date': datetime.now(timezone.utc),
-                'image_url': image_url
-            })
-            
-        return articles
+        # Parsing is CPU-bound, so it runs in the process pool rather than on the event loop
+        parsed = await feed_parser_pool.parse(
+            response["content"],
+            known_ids=feed_doc.get('last_entry_ids'),
+            since=feed_doc.get('last_published_at')
+        )
+        return {"status": "ok", "articles": parsed["articles"], "validators": validators, "watermark": parsed["watermark"]}
     except Exception as e:
-        logging.error(f"Error fetching RSS feed {url}: {str(e)}")
-        return []
+        logging.error(f"Error fetching RSS feed {feed_doc['url']}: {str(e)}")
+        return {"status": "failed", "articles": [], "validators": {}, "watermark": {}, "error": str(e)}
 
 async def extract_keywords_and_tags(content: str) -> tuple:
     """Extract keywords and tags from content using simple NLP"""
-    # Simple keyword extraction (in production, use proper NLP libraries)
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', content.lower())
-    word_freq = {}
-    
-    # Count word frequency
-    for word in words:
-        if word not in ['this', 'that', 'with', 'have', 'will', 'from', 'they', 'been', 'were', 'said', 'each', 'which', 'their', 'time', 'would', 'there', 'could', 'more', 'than', 'into', 'very', 'what', 'know', 'just', 'first', 'also', 'after', 'back', 'other', 'many', 'them', 'these', 'some', 'like', 'even', 'most', 'made', 'only', 'over', 'think', 'where', 'being', 'through', 'much', 'before', 'right', 'should', 'still', 'such', 'between', 'both', 'under', 'never', 'while', 'another', 'without', 'again', 'come', 'make', 'then']:
-            word_freq[word] = word_freq.get(word, 0) + 1
-    
-    # Get top keywords
-    keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:10]
-    keywords = [kw[0] for kw in keywords]
-    
-    # Generate tags based on content themes
-    tech_terms = ['ai', 'artificial', 'intelligence', 'machine', 'learning', 'technology', 'tech', 'software', 'hardware', 'cloud', 'data', 'digital', 'mobile', 'app', 'programming', 'development', 'startup', 'innovation', 'blockchain', 'crypto', 'cybersecurity', 'gaming']
-    tags = [term for term in tech_terms if term in content.lower()]
-    
-    return keywords, tags
+    return extract_keywords_and_tags_batch([content], taxonomy_store.matcher, term_statistics.snapshot)[0]
 
 # Authentication Routes
 @api_router.post("/auth/register", response_model=User)
@@ -381,6 +481,7 @@ async def create_api_key(api_key_data: APIKeyCreate, current_user: User = Depend
     """Create a new API key (Admin only)"""
     api_key = APIKey(**api_key_data.dict())
     await db.api_keys.insert_one(api_key.dict())
+    key_pool.invalidate()
     return api_key
 
 @api_router.get("/admin/api-keys", response_model=List[APIKey])
@@ -410,6 +511,7 @@ async def update_api_key(key_id: str, updates: APIKeyUpdate, current_user: User
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="API key not found")
     
+    key_pool.invalidate()
     return {"message": "API key updated successfully"}
 
 @api_router.delete("/admin/api-keys/{key_id}")
@@ -420,6 +522,7 @@ async def delete_api_key(key_id: str, current_user: User = Depends(get_current_a
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="API key not found")
     
+    key_pool.invalidate()
     return {"message": "API key deleted successfully"}
 
 # Test API key endpoint
@@ -453,6 +556,36 @@ async def test_api_key(key_id: str, current_user: User = Depends(get_current_adm
             "message": f"API key test failed: {str(e)}"
         }
 
+# Tag Taxonomy Management (Admin Only)
+@api_router.get("/admin/taxonomy")
+async def get_taxonomy(current_user: User = Depends(get_current_admin_user)):
+    """Get the tag taxonomy used for article tagging (Admin only)"""
+    return [{"tag": tag, "synonyms": synonyms} for tag, synonyms in taxonomy_store.taxonomy.items()]
+
+@api_router.put("/admin/taxonomy/{tag}")
+async def update_taxonomy_term(tag: str, updates: TaxonomyTermUpdate, current_user: User = Depends(get_current_admin_user)):
+    """Create or update a tag and its synonyms (Admin only)"""
+    await taxonomy_store.upsert(tag, updates.synonyms)
+    return {"message": "Taxonomy updated successfully", "terms": len(taxonomy_store.taxonomy)}
+
+@api_router.delete("/admin/taxonomy/{tag}")
+async def delete_taxonomy_term(tag: str, current_user: User = Depends(get_current_admin_user)):
+    """Delete a tag from the taxonomy (Admin only)"""
+    if not await taxonomy_store.delete(tag):
+        raise HTTPException(status_code=404, detail="Tag not found")
+    return {"message": "Tag deleted successfully"}
+
+@api_router.get("/admin/generation-cache")
+async def get_generation_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """Get generation cache size and hit counts (Admin only)"""
+    return generation_cache.stats()
+
+@api_router.delete("/admin/generation-cache")
+async def clear_generation_cache(current_user: User = Depends(get_current_admin_user)):
+    """Drop every cached generation (Admin only)"""
+    generation_cache.clear()
+    return {"message": "Generation cache cleared"}
+
 # Rest of the original API routes with admin protection where needed...
 
 @api_router.get("/")
@@ -500,96 +633,265 @@ async def initialize_default_feeds(current_user: User = Depends(get_current_admi
 @api_router.post("/articles/collect")
 async def collect_articles(background_tasks: BackgroundTasks, current_user: User = Depends(get_current_admin_user)):
     """Collect articles from all active RSS feeds (Admin only)"""
-    background_tasks.add_task(collect_articles_background)
-    return {"message": "Article collection started in background"}
+    run = collection_runs.create(feeds_total=0)
+    background_tasks.add_task(collect_articles_background, run)
+    return {"message": "Article collection started in background", "job_id": run.id}
 
-async def collect_articles_background():
-    """Background task to collect articles"""
-    feeds = await db.rss_feeds.find({"is_active": True}).to_list(1000)
-    total_collected = 0
+@api_router.get("/articles/collect/{job_id}")
+async def get_collection_run(job_id: str):
+    """Get the progress summary of a collection run (Public)"""
+    summary = await collection_runs.load_summary(job_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Collection run not found")
+    return summary
+
+@api_router.get("/articles/collect/{job_id}/events")
+async def stream_collection_run(job_id: str):
+    """Stream per-feed progress of a collection run as server-sent events (Public)"""
+    run = collection_runs.get(job_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Collection run not found")
     
-    for feed in feeds:
-        articles_data = await fetch_rss_feed(feed['url'])
-        
-        for article_data in articles_data:
-            # Check if article already exists
-            existing = await db.news_articles.find_one({"url": article_data['url']})
-            if existing:
-                continue
-            
-            # Extract keywords and tags
-            keywords, tags = await extract_keywords_and_tags(article_data.get('summary', '') + ' ' + article_data.get('title', ''))
-            
-            article = NewsArticle(
-                title=article_data['title'],
-                summary=article_data['summary'],
-                content=article_data['summary'],  # In production, fetch full content
-                url=article_data['url'],
-                source=feed['title'],
-                category=feed['category'],
-                language=feed['language'],
-                published_date=article_data['published_date'],
-                image_url=article_data.get('image_url'),
-                keywords=keywords,
-                tags=tags,
-                seo_score=85  # Base SEO score
-            )
-            
-            await db.news_articles.insert_one(article.dict())
-            total_collected += 1
+    async def event_stream():
+        async for event in run.stream():
+            yield format_sse(event)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def collect_articles_background(run: Optional[CollectionRun] = None):
+    """Background task to collect articles from all active feeds concurrently"""
+    run = run or collection_runs.create(feeds_total=0)
+    try:
+        feeds = await db.rss_feeds.find({"is_active": True}).to_list(1000)
+        run.feeds_total = len(feeds)
+        run.publish({"type": "run_started", "feeds_total": run.feeds_total})
         
-        # Update last fetched time
-        await db.rss_feeds.update_one(
-            {"id": feed['id']},
-            {"$set": {"last_fetched": datetime.now(timezone.utc)}}
+        # Feeds are fetched concurrently; FeedFetcher enforces the global and per-host caps
+        results = await asyncio.gather(*(collect_feed_articles(feed, run) for feed in feeds), return_exceptions=True)
+        for feed, result in zip(feeds, results):
+            if isinstance(result, Exception):
+                logging.error(f"Error collecting feed {feed['url']}: {str(result)}")
+        run.finish()
+    except Exception as e:
+        logging.error(f"Collection run {run.id} failed: {str(e)}")
+        run.finish("failed", error=str(e))
+    
+    await collection_runs.persist(run)
+    logging.info(f"Collected {run.totals['inserted']} new articles from {run.feeds_total} feeds in {run.summary()['elapsed']:.1f}s")
+
+async def collect_feed_articles(feed: Dict, run: Optional[CollectionRun] = None) -> Dict:
+    """Fetch one feed and store its new articles, returning the feed's run stats"""
+    started = datetime.now(timezone.utc)
+    stats = {"feed_id": feed['id'], "feed": feed['title'], "status": "failed", "parsed": 0, "duplicates": 0, "inserted": 0}
+    try:
+        await _collect_feed_articles(feed, stats, run)
+    except Exception as e:
+        stats["error"] = str(e)
+        raise
+    finally:
+        stats["elapsed"] = round((datetime.now(timezone.utc) - started).total_seconds(), 3)
+        if run is not None:
+            run.feed_finished(stats)
+    return stats
+
+async def _collect_feed_articles(feed: Dict, stats: Dict, run: Optional[CollectionRun]):
+    # Feeds with an open circuit are not fetched until their backoff expires
+    if not breaker_allows(feed):
+        stats["status"] = "circuit_open"
+        if run is not None:
+            run.feed_stage(feed, "circuit_open", retry_at=feed.get('retry_at'))
+        return
+    
+    result = await fetch_rss_feed(feed)
+    stats["status"] = result["status"]
+    stats["parsed"] = len(result["articles"])
+    if "error" in result:
+        stats["error"] = result["error"]
+    if run is not None:
+        run.feed_stage(feed, "fetched" if result["status"] == "ok" else result["status"], parsed=stats["parsed"])
+    
+    # Deduplicate the whole batch against the database with a single $in lookup
+    batch = {}
+    for article_data in result["articles"]:
+        if article_data['url']:
+            batch.setdefault(url_hash(article_data['url']), article_data)
+    existing = await find_existing_hashes(db.news_articles, list(batch.keys()))
+    
+    # Fingerprint the unseen entries and fold syndicated copies of known stories into their canonical article
+    candidates = []
+    fingerprints = []
+    for article_hash, article_data in batch.items():
+        if article_hash in existing:
+            continue
+        article_id = str(uuid.uuid4())
+        candidates.append((article_id, article_hash, article_data))
+        fingerprint = minhash(article_data['title'] + ' ' + article_data['summary'])
+        if fingerprint is not None:
+            fingerprints.append((article_id, fingerprint))
+    canonicals = await near_duplicate_index.find_canonicals(fingerprints)
+    
+    originals = [candidate for candidate in candidates if candidate[0] not in canonicals]
+    
+    # Extract keywords and tags for the whole batch in one call, ranked by TF-IDF against the corpus
+    texts = [article_data.get('summary', '') + ' ' + article_data.get('title', '') for _, _, article_data in originals]
+    extracted = extract_keywords_and_tags_batch(texts, taxonomy_store.matcher, term_statistics.snapshot)
+    
+    new_articles = []
+    for (article_id, article_hash, article_data), (keywords, tags) in zip(originals, extracted):
+        article = NewsArticle(
+            id=article_id,
+            title=article_data['title'],
+            summary=article_data['summary'],
+            content=article_data['summary'],  # Replaced by the extracted page text when extraction is enabled
+            url=article_data['url'],
+            url_hash=article_hash,
+            source=feed['title'],
+            category=feed['category'],
+            language=feed['language'],
+            published_date=article_data['published_date'],
+            image_url=article_data.get('image_url'),
+            keywords=keywords,
+            tags=tags,
+            seo_score=85  # Base SEO score
         )
+        new_articles.append(article.dict())
     
-    logging.info(f"Collected {total_collected} new articles")
+    # Unordered upserts on the unique url_hash index stay correct when runs overlap
+    collected = await insert_new_articles(db.news_articles, new_articles)
+    stats["inserted"] = collected
+    stats["duplicates"] = stats["parsed"] - collected
+    if collected:
+        await term_statistics.record(texts)
+        await trending_sketches.record(feed['category'], [doc['keywords'] + doc['tags'] for doc in new_articles])
+        await near_duplicate_index.add([fp for fp in fingerprints if fp[0] not in canonicals])
+        article_extractor.enqueue(new_articles)
+        search_index.add_documents("articles", new_articles)
+        suggest_index.add_documents(new_articles)
+        await semantic_index.add_documents("articles", new_articles)
+    # Linked after the insert so copies of a canonical from this same batch find it
+    await link_duplicates(db.news_articles, [
+        {"canonical_id": canonicals[article_id], "url_hash": article_hash, "source": feed['title']}
+        for article_id, article_hash, _ in candidates if article_id in canonicals
+    ])
+    
+    # Update last fetched time, the validators for the next conditional request, the watermark,
+    # the breaker state and the poll schedule
+    now = datetime.now(timezone.utc)
+    breaker = breaker_update(feed, result.get("error"), now)
+    schedule = next_poll_schedule(feed, collected, now)
+    if breaker["retry_at"] is not None:
+        schedule["next_fetch_at"] = max(schedule["next_fetch_at"], breaker["retry_at"])
+    await db.rss_feeds.update_one(
+        {"id": feed['id']},
+        {"$set": {
+            "last_fetched": now,
+            **result["validators"],
+            **result["watermark"],
+            **breaker,
+            **schedule
+        }}
+    )
+
+# Downloads full article pages in the background (started with the app when enabled)
+article_extractor = ArticleExtractor(db.news_articles)
+
+# Manual collection runs, streamed to clients as they progress
+collection_runs = CollectionRunRegistry(db.collection_runs)
+
+# Polls each feed on its own adaptive interval (started with the app)
+feed_scheduler = FeedScheduler(db.rss_feeds, collect_feed_articles)
 
-@api_router.get("/articles", response_model=List[NewsArticle])
-async def get_articles(limit: int = 50, category: Optional[str] = None):
-    """Get collected articles (Public)"""
+@api_router.get("/articles", response_model=Union[List[NewsArticle], List[NewsArticleCard]])
+async def get_articles(response: Response, limit: int = 50, category: Optional[str] = None,
+                       cursor: Optional[str] = None, view: str = "full"):
+    """Get collected articles, newest first; the next page's cursor is in the X-Next-Cursor header (Public)"""
+    if view not in ("full", "card"):
+        raise HTTPException(status_code=400, detail="view must be 'full' or 'card'")
     query = {}
     if category:
         query["category"] = category
     
-    articles = await db.news_articles.find(query).sort("created_at", -1).limit(limit).to_list(limit)
-    return [NewsArticle(**article) for article in articles]
+    projection = card_projection(NewsArticleCard) if view == "card" else None
+    try:
+        articles, next_cursor = await fetch_page(db.news_articles, query, limit, cursor, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    model = NewsArticleCard if view == "card" else NewsArticle
+    return [model(**article) for article in articles]
 
 # Content Generation with Failover
-@api_router.post("/generate", response_model=GeneratedContent)
-async def generate_content(request: ContentGenerationRequest, current_user: User = Depends(get_current_user)):
-    """Generate AI content based on trending articles"""
-    try:
-        # Get relevant articles based on topics
-        query = {"$or": []}
-        for topic in request.topics:
-            query["$or"].extend([
-                {"title": {"$regex": topic, "$options": "i"}},
-                {"summary": {"$regex": topic, "$options": "i"}},
-                {"keywords": {"$in": [topic.lower()]}},
-                {"tags": {"$in": [topic.lower()]}}
-            ])
-        
-        if not query["$or"]:
-            # If no specific topics, get latest trending articles
-            query = {"created_at": {"$gte": datetime.now(timezone.utc).replace(hour=0, minute=0, second=0)}}
-        
-        articles = await db.news_articles.find(query).sort("created_at", -1).limit(request.article_count).to_list(request.article_count)
-        
+async def select_source_articles(request: ContentGenerationRequest) -> List[Dict]:
+    """Source articles for a generation request: confirmed matches by embedding, else by the text index"""
+    topics = " ".join(request.topics)
+    if topics.strip():
+        articles = []
+        if semantic_index.ready:
+            candidates = await find_in_order(db.news_articles, semantic_index.search(
+                topics, max(SEMANTIC_MATCH_CANDIDATES, request.article_count), kind="articles"
+            ))
+            articles = confirm_matches(topics, candidates, request.article_count)
         if not articles:
-            raise HTTPException(status_code=404, detail="No relevant articles found for the given topics")
-        
-        # Prepare content for AI generation
-        article_summaries = []
-        for article in articles:
-            article_summaries.append(f"Title: {article['title']}\nSummary: {article['summary']}\nSource: {article['source']}")
-        
-        combined_content = "\n\n---\n\n".join(article_summaries)
-        
-        # Create AI prompt based on language and requirements
-        prompts = {
-            "english": f"""Based on the following {len(articles)} tech news articles, create a comprehensive, engaging, and SEO-optimized article that:
+            articles = await text_search(db.news_articles, topics, request.article_count)
+        return articles
+    
+    # If no specific topics, use the terms trending over the last day
+    trending = await trending_sketches.top("24h", limit=5)
+    trending_terms = [item["term"] for item in trending["terms"]]
+    if trending_terms:
+        query = {"$or": [{"keywords": {"$in": trending_terms}}, {"tags": {"$in": trending_terms}}]}
+    else:
+        query = {"created_at": {"$gte": datetime.now(timezone.utc).replace(hour=0, minute=0, second=0)}}
+    return await db.news_articles.find(query).sort("created_at", -1).limit(request.article_count).to_list(request.article_count)
+
+async def select_source_articles_batch(requests: List[ContentGenerationRequest]) -> List[List[Dict]]:
+    """Source articles for many requests, ranked in memory and fetched from Mongo in one query
+
+    Requests the semantic index cannot serve (no topics, no confirmed matches, or the index is
+    disabled) fall back to select_source_articles one by one.
+    """
+    rankings = [[] for _ in requests]
+    if semantic_index.ready:
+        for i, request in enumerate(requests):
+            topics = " ".join(request.topics)
+            if topics.strip():
+                rankings[i] = semantic_index.search(
+                    topics, max(SEMANTIC_MATCH_CANDIDATES, request.article_count), kind="articles"
+                )
+    
+    ids = list({doc_id for ranked in rankings for doc_id, _ in ranked})
+    by_id = {}
+    if ids:
+        docs = await db.news_articles.find({"id": {"$in": ids}}).to_list(len(ids))
+        by_id = {doc["id"]: doc for doc in docs}
+    
+    selections = []
+    for request, ranked in zip(requests, rankings):
+        candidates = [by_id[doc_id] for doc_id, _ in ranked if doc_id in by_id]
+        articles = confirm_matches(" ".join(request.topics), candidates, request.article_count)
+        selections.append(articles or await select_source_articles(request))
+    return selections
+
+# Bump whenever the prompt wording changes, so cached generations from the old prompt are not reused
+PROMPT_TEMPLATE_VERSION = 1
+
+def build_generation_prompt(request: ContentGenerationRequest, articles: List[Dict]) -> str:
+    """Prompt for synthesizing an article from the source articles in the requested language"""
+    # Prepare content for AI generation
+    article_summaries = []
+    for article in articles:
+        article_summaries.append(f"Title: {article['title']}\nSummary: {article['summary']}\nSource: {article['source']}")
+    
+    combined_content = "\n\n---\n\n".join(article_summaries)
+    
+    # Create AI prompt based on language and requirements
+    prompts = {
+        "english": f"""Based on the following {len(articles)} tech news articles, create a comprehensive, engaging, and SEO-optimized article that:
 
 1. Synthesizes the key information and trends
 2. Provides unique insights and analysis
@@ -603,7 +905,7 @@ Source Articles:
 
 Write an article that combines these stories into a cohesive, insightful piece that would rank well on search engines and engage readers. Make it sound like it was written by an experienced tech journalist, not AI.""",
 
-            "hindi": f"""निम्नलिखित {len(articles)} टेक न्यूज़ आर्टिकल्स के आधार पर एक व्यापक, आकर्षक और SEO-अनुकूलित आर्टिकल बनाएं जो:
+        "hindi": f"""निम्नलिखित {len(articles)} टेक न्यूज़ आर्टिकल्स के आधार पर एक व्यापक, आकर्षक और SEO-अनुकूलित आर्टिकल बनाएं जो:
 
 1. मुख्य जानकारी और ट्रेंड्स को संयोजित करे
 2. अनूठी अंतर्दृष्टि और विश्लेषण प्रदान करे
@@ -616,7 +918,7 @@ Write an article that combines these stories into a cohesive, insightful piece t
 
 एक ऐसा आर्टिकल लिखें जो इन कहानियों को एक सुसंगत, अंतर्दृष्टिपूर्ण टुकड़े में संयोजित करे।""",
 
-            "bangla": f"""নিম্নলিখিত {len(articles)}টি টেক নিউজ আর্টিকেলের ভিত্তিতে একটি ব্যাপক, আকর্ষণীয় এবং SEO-অপ্টিমাইজড আর্টিকেল তৈরি করুন যা:
+        "bangla": f"""নিম্নলিখিত {len(articles)}টি টেক নিউজ আর্টিকেলের ভিত্তিতে একটি ব্যাপক, আকর্ষণীয় এবং SEO-অপ্টিমাইজড আর্টিকেল তৈরি করুন যা:
 
 1. মূল তথ্য এবং ট্রেন্ডগুলি সংযুক্ত করে
 2. অনন্য অন্তর্দৃষ্টি এবং বিশ্লেষণ প্রদান করে
@@ -628,66 +930,229 @@ Write an article that combines these stories into a cohesive, insightful piece t
 {combined_content}
 
 একটি আর্টিকেল লিখুন যা এই গল্পগুলিকে একটি সুসংগত, অন্তর্দৃষ্টিপূর্ণ অংশে সংযুক্ত করে।"""
-        }
-        
-        # Generate content using failover system
-        chat, api_key_used = await get_llm_chat_with_failover(request.language)
-        user_message = UserMessage(text=prompts.get(request.language, prompts["english"]))
-        
+    }
+    
+    return prompts.get(request.language, prompts["english"])
+
+def generation_cache_key_for(request: ContentGenerationRequest, articles: List[Dict]) -> str:
+    return generation_cache_key(
+        [article['id'] for article in articles], request.language, request.tone, request.length,
+        request.include_seo, PROMPT_TEMPLATE_VERSION
+    )
+
+async def build_generated_content(request: ContentGenerationRequest, articles: List[Dict],
+                                  generated_text: str, api_key_used: str) -> GeneratedContent:
+    """Turn the model output into a GeneratedContent record: title, summary, keywords and tags"""
+    # Extract title (assume first line is title)
+    lines = generated_text.split('\n')
+    title = lines[0].strip().replace('#', '').strip()
+    content = '\n'.join(lines[1:]).strip()
+    
+    # Generate summary (first 200 chars)
+    summary = content[:200] + "..." if len(content) > 200 else content
+    
+    # Extract keywords and tags
+    keywords, tags = await extract_keywords_and_tags(generated_text)
+    
+    # Add topic-specific keywords
+    for topic in request.topics:
+        if normalize_token(topic) not in keywords:
+            keywords.append(normalize_token(topic))
+    
+    return GeneratedContent(
+        title=title,
+        content=content,
+        summary=summary,
+        language=request.language,
+        original_articles=[article['id'] for article in articles],
+        keywords=keywords[:15],  # Limit to 15 keywords
+        tags=tags[:10],  # Limit to 10 tags
+        tone=request.tone,
+        word_count=len(content.split()),
+        seo_score=100 if request.include_seo else 85,
+        api_key_used=api_key_used
+    )
+
+async def store_generated_content(generated_content: GeneratedContent):
+    """Persist generated content and add it to the search indexes"""
+    await db.generated_content.insert_one(generated_content.dict())
+    search_index.add_documents("content", [generated_content.dict()])
+    suggest_index.add_documents([generated_content.dict()])
+    await semantic_index.add_documents("content", [generated_content.dict()])
+
+async def generate_for_request(request: ContentGenerationRequest, articles: Optional[List[Dict]] = None) -> GeneratedContent:
+    """Select sources (unless given), generate (or reuse a cached generation) and store the result"""
+    if articles is None:
+        articles = await select_source_articles(request)
+    if not articles:
+        raise HTTPException(status_code=404, detail="No relevant articles found for the given topics")
+    
+    # The same sources and settings produce the same prompt, so a cached result is returned without an LLM call
+    cache_key = generation_cache_key_for(request, articles)
+    if not request.bypass_cache:
+        cached = generation_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    # Generate content using failover system
+    chat, api_key_used, provider = await get_llm_chat_with_failover(request.language)
+    user_message = UserMessage(text=build_generation_prompt(request, articles))
+    
+    # A failed send keeps its reservation: timeouts and server errors may already have used quota
+    async with llm_limits.slot(provider, api_key_used):
         response = await chat.send_message(user_message)
-        generated_text = response
-        
-        # Increment API key usage if not emergent fallback
-        if api_key_used != "emergent_fallback":
-            await increment_api_key_usage(api_key_used)
-        
-        # Extract title (assume first line is title)
-        lines = generated_text.split('\n')
-        title = lines[0].strip().replace('#', '').strip()
-        content = '\n'.join(lines[1:]).strip()
-        
-        # Generate summary (first 200 chars)
-        summary = content[:200] + "..." if len(content) > 200 else content
-        
-        # Extract keywords and tags
-        keywords, tags = await extract_keywords_and_tags(generated_text)
-        
-        # Add topic-specific keywords
-        for topic in request.topics:
-            if topic.lower() not in keywords:
-                keywords.append(topic.lower())
-        
-        # Create generated content record
-        generated_content = GeneratedContent(
-            title=title,
-            content=content,
-            summary=summary,
-            language=request.language,
-            original_articles=[article['id'] for article in articles],
-            keywords=keywords[:15],  # Limit to 15 keywords
-            tags=tags[:10],  # Limit to 10 tags
-            tone=request.tone,
-            word_count=len(content.split()),
-            seo_score=100 if request.include_seo else 85,
-            api_key_used=api_key_used
-        )
-        
-        await db.generated_content.insert_one(generated_content.dict())
-        return generated_content
-        
+    generated_text = response
+    
+    # Create generated content record
+    generated_content = await build_generated_content(request, articles, generated_text, api_key_used)
+    await store_generated_content(generated_content)
+    generation_cache.put(cache_key, generated_content)
+    return generated_content
+
+async def run_generation_job(job: Dict) -> str:
+    """Run a queued generation request and return the generated content's id"""
+    generated_content = await generate_for_request(ContentGenerationRequest(**job["request"]))
+    return generated_content.id
+
+generation_jobs = GenerationJobQueue(db.generation_jobs, run_generation_job)
+
+def check_cache_bypass(request: ContentGenerationRequest, current_user: User):
+    if request.bypass_cache and not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Only admins can bypass the generation cache")
+
+@api_router.post("/generate", response_model=GeneratedContent)
+async def generate_content(request: ContentGenerationRequest, current_user: User = Depends(get_current_user)):
+    """Generate AI content based on trending articles"""
+    check_cache_bypass(request, current_user)
+    try:
+        return await generate_for_request(request)
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error generating content: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Content generation failed: {str(e)}")
 
-@api_router.get("/content", response_model=List[GeneratedContent])
-async def get_generated_content(limit: int = 20, language: Optional[str] = None):
-    """Get generated content (Public)"""
+@api_router.post("/generate/jobs")
+async def submit_generation_job(request: ContentGenerationRequest, current_user: User = Depends(get_current_user)):
+    """Queue a content generation and return its job id immediately"""
+    check_cache_bypass(request, current_user)
+    job = await generation_jobs.submit(request.dict(), current_user.id)
+    return {"job_id": job["id"], "status": job["status"]}
+
+@api_router.get("/generate/jobs/{job_id}")
+async def get_generation_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """Get a generation job's status, with the generated content once it has completed"""
+    job = await generation_jobs.get(job_id)
+    if not job or (job["user_id"] != current_user.id and not current_user.is_admin):
+        raise HTTPException(status_code=404, detail="Generation job not found")
+    result = None
+    if job.get("result_id"):
+        content = await db.generated_content.find_one({"id": job["result_id"]})
+        result = GeneratedContent(**content) if content else None
+    return {**job, "result": result}
+
+@api_router.post("/generate/stream")
+async def stream_generated_content(request: ContentGenerationRequest, current_user: User = Depends(get_current_user)):
+    """Generate content as server-sent events: the sources, text tokens as they arrive, then the stored record"""
+    check_cache_bypass(request, current_user)
+    articles = await select_source_articles(request)
+    if not articles:
+        raise HTTPException(status_code=404, detail="No relevant articles found for the given topics")
+    
+    async def event_stream():
+        yield format_sse({"type": "sources", "articles": [{"id": a['id'], "title": a['title']} for a in articles]})
+        cache_key = generation_cache_key_for(request, articles)
+        cached = None if request.bypass_cache else generation_cache.get(cache_key)
+        if cached is not None:
+            yield format_sse({"type": "token", "text": f"{cached.title}\n\n{cached.content}"})
+            yield format_sse({"type": "done", "content": cached.dict(), "cached": True})
+            return
+        
+        try:
+            used = {}
+            chunks = []
+            async for chunk in stream_llm_text(request.language, build_generation_prompt(request, articles), used):
+                chunks.append(chunk)
+                yield format_sse({"type": "token", "text": chunk})
+            
+            # Title parsing, keywords and persistence need the whole text, so they run once the stream ends
+            api_key_used = used["api_key_id"]
+            generated_content = await build_generated_content(request, articles, "".join(chunks), api_key_used)
+            await store_generated_content(generated_content)
+            generation_cache.put(cache_key, generated_content)
+            yield format_sse({"type": "done", "content": generated_content.dict(), "cached": False})
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e)
+            logging.error(f"Error streaming content generation: {detail}")
+            yield format_sse({"type": "error", "detail": f"Content generation failed: {detail}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.post("/generate/batch")
+async def generate_content_batch(batch: BatchGenerationRequest, current_user: User = Depends(get_current_user)):
+    """Generate several items concurrently, streaming each result (or its error) as server-sent events as it finishes"""
+    for request in batch.items:
+        check_cache_bypass(request, current_user)
+    selections = await select_source_articles_batch(batch.items)
+    
+    async def generate_item(index: int, request: ContentGenerationRequest, articles: List[Dict]) -> Dict:
+        try:
+            if not articles:
+                raise HTTPException(status_code=404, detail="No relevant articles found for the given topics")
+            generated_content = await generate_for_request(request, articles)
+            return {"type": "item", "index": index, "status": "completed", "content": generated_content.dict()}
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e)
+            logging.error(f"Batch item {index} failed: {detail}")
+            return {"type": "item", "index": index, "status": "failed", "error": detail}
+    
+    async def event_stream():
+        # LLM calls run concurrently, bounded by the per-provider and per-key limits
+        tasks = [
+            asyncio.create_task(generate_item(index, request, articles))
+            for index, (request, articles) in enumerate(zip(batch.items, selections))
+        ]
+        completed = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                event = await next_result
+                completed += event["status"] == "completed"
+                yield format_sse(event)
+            yield format_sse({"type": "batch_done", "completed": completed, "failed": len(tasks) - completed})
+        finally:
+            # A client that disconnects early stops the generations still waiting
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/content", response_model=Union[List[GeneratedContent], List[GeneratedContentCard]])
+async def get_generated_content(response: Response, limit: int = 20, language: Optional[str] = None,
+                                cursor: Optional[str] = None, view: str = "full"):
+    """Get generated content, newest first; the next page's cursor is in the X-Next-Cursor header (Public)"""
+    if view not in ("full", "card"):
+        raise HTTPException(status_code=400, detail="view must be 'full' or 'card'")
     query = {}
     if language:
         query["language"] = language
     
-    content = await db.generated_content.find(query).sort("created_at", -1).limit(limit).to_list(limit)
-    return [GeneratedContent(**item) for item in content]
+    projection = card_projection(GeneratedContentCard) if view == "card" else None
+    try:
+        content, next_cursor = await fetch_page(db.generated_content, query, limit, cursor, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    model = GeneratedContentCard if view == "card" else GeneratedContent
+    return [model(**item) for item in content]
 
 @api_router.get("/content/{content_id}", response_model=GeneratedContent)
 async def get_content_by_id(content_id: str):
@@ -788,38 +1253,65 @@ async def get_analytics():
         }
     }
 
+async def find_in_order(collection, ranked: List[tuple]) -> List[Dict]:
+    """Fetch the documents of (id, score) search results, keeping the ranking"""
+    if not ranked:
+        return []
+    docs = await collection.find({"id": {"$in": [doc_id for doc_id, _ in ranked]}}).to_list(len(ranked))
+    by_id = {doc["id"]: doc for doc in docs}
+    return [by_id[doc_id] for doc_id, _ in ranked if doc_id in by_id]
+
+async def ranked_search(kind: str, collection, q: str, limit: int, mode: str = "keyword") -> List[Dict]:
+    """Search one collection semantically, through the BM25 index when it is enabled, or the Mongo text index"""
+    if mode == "semantic":
+        return await find_in_order(collection, semantic_index.search(q, limit, kind=kind))
+    if search_index.ready:
+        docs = await find_in_order(collection, search_index.search(q, limit, kind=kind))
+        if docs:
+            return docs
+    # Queries with no indexed terms (e.g. words shorter than four letters) still go through Mongo
+    return await text_search(collection, q, limit)
+
 # Search functionality (Public)
 @api_router.get("/search")
-async def search_content(q: str, type: str = "all", limit: int = 10):
-    """Search articles and generated content (Public)"""
+async def search_content(q: str, type: str = "all", limit: int = 10, mode: str = "keyword"):
+    """Search articles and generated content by keyword or by meaning (Public)"""
+    if mode not in ("keyword", "semantic"):
+        raise HTTPException(status_code=400, detail="mode must be 'keyword' or 'semantic'")
+    if mode == "semantic" and not semantic_index.ready:
+        raise HTTPException(status_code=400, detail="Semantic search is not enabled")
     results = {"articles": [], "generated_content": []}
     
     if type in ["all", "articles"]:
-        article_query = {
-            "$or": [
-                {"title": {"$regex": q, "$options": "i"}},
-                {"summary": {"$regex": q, "$options": "i"}},
-                {"keywords": {"$in": [q.lower()]}},
-                {"tags": {"$in": [q.lower()]}}
-            ]
-        }
-        articles = await db.news_articles.find(article_query).limit(limit).to_list(limit)
+        articles = await ranked_search("articles", db.news_articles, q, limit, mode)
         results["articles"] = [NewsArticle(**article) for article in articles]
     
     if type in ["all", "content"]:
-        content_query = {
-            "$or": [
-                {"title": {"$regex": q, "$options": "i"}},
-                {"content": {"$regex": q, "$options": "i"}},
-                {"keywords": {"$in": [q.lower()]}},
-                {"tags": {"$in": [q.lower()]}}
-            ]
-        }
-        content = await db.generated_content.find(content_query).limit(limit).to_list(limit)
+        content = await ranked_search("content", db.generated_content, q, limit, mode)
         results["generated_content"] = [GeneratedContent(**item) for item in content]
     
     return results
 
+@api_router.get("/search/suggest")
+async def suggest_search(q: str, limit: int = 10):
+    """Completions of the last word of a search query, from in-memory term counts (Public)"""
+    words = q.split()
+    if not words or q[-1].isspace():
+        return {"query": q, "suggestions": []}
+    head = q.rstrip()[:-len(words[-1])]
+    suggestions = suggest_index.suggest(words[-1], max(1, min(limit, 50)))
+    for suggestion in suggestions:
+        suggestion["text"] = head + suggestion["term"]
+    return {"query": q, "suggestions": suggestions}
+
+# Trending topics (Public)
+@api_router.get("/trending")
+async def get_trending(window: str = "1h", category: Optional[str] = None, limit: int = 20):
+    """Get trending terms over the last hour or day, answered from time-bucketed sketches (Public)"""
+    if window not in TREND_WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window must be one of: {', '.join(TREND_WINDOWS)}")
+    return await trending_sketches.top(window, category, min(limit, 100))
+
 # Admin System Stats
 @api_router.get("/admin/stats")
 async def get_admin_stats(current_user: User = Depends(get_current_admin_user)):
@@ -866,6 +1358,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Configure logging
@@ -875,14 +1368,70 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def ensure_indexes():
+    """Create the indexes the ingestion and listing paths rely on"""
+    await db.news_articles.create_index(
+        "url_hash", unique=True, partialFilterExpression={"url_hash": {"$exists": True}}
+    )
+    # Keyset pagination indexes for /api/articles and /api/content, with and without their filter
+    await db.news_articles.create_index([("created_at", -1), ("id", -1)])
+    await db.news_articles.create_index([("category", 1), ("created_at", -1), ("id", -1)])
+    await db.generated_content.create_index([("created_at", -1), ("id", -1)])
+    await db.generated_content.create_index([("language", 1), ("created_at", -1), ("id", -1)])
+    await db.news_articles.create_index("duplicate_url_hashes")
+    # Multikey indexes behind the trending keyword and tag lookups in /api/generate
+    await db.news_articles.create_index("keywords")
+    await db.news_articles.create_index("tags")
+    await db.generated_content.create_index("keywords")
+    await db.generated_content.create_index("tags")
+    await ensure_text_index(db.news_articles, ARTICLE_TEXT_WEIGHTS)
+    await ensure_text_index(db.generated_content, CONTENT_TEXT_WEIGHTS)
+    await db.rss_feeds.create_index([("is_active", 1), ("next_fetch_at", 1)])
+    await near_duplicate_index.ensure_indexes()
+    await db.tag_taxonomy.create_index("tag", unique=True)
+    await db.term_stats.create_index("term", unique=True)
+    await db.term_stats.create_index("df")
+    await trending_sketches.ensure_indexes()
+    await semantic_index.ensure_indexes()
+    await generation_jobs.ensure_indexes()
+    backfilled = await backfill_url_hashes(db.news_articles)
+    if backfilled:
+        logger.info(f"Backfilled url_hash on {backfilled} articles")
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("TechPulse AI API with Admin Controls starting up...")
+    await ensure_indexes()
+    await taxonomy_store.load()
+    taxonomy_store.start()
+    term_statistics.start()
+    if BM25_SEARCH_ENABLED:
+        search_index.start(db.news_articles, db.generated_content)
+    if SEMANTIC_SEARCH_ENABLED:
+        semantic_index.start(db.news_articles, db.generated_content)
+    suggest_index.start([db.news_articles, db.generated_content])
+    await generation_jobs.start()
+    if ARTICLE_EXTRACTION_ENABLED:
+        article_extractor.start()
+    if FEED_SCHEDULER_ENABLED:
+        feed_scheduler.start()
+    await feed_fetcher.start()
     # Reset daily usage counters (you might want to schedule this daily)
     # await reset_daily_usage()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await feed_scheduler.stop()
+    await generation_jobs.stop()
+    await key_pool.close()
+    await taxonomy_store.stop()
+    await term_statistics.stop()
+    await search_index.stop()
+    await semantic_index.stop()
+    await suggest_index.stop()
+    await article_extractor.stop()
+    await feed_fetcher.close()
+    feed_parser_pool.close()
     client.close()
     logger.info("TechPulse AI API shutting down...")
 
@@ -0,0 +1,130 @@
+import asyncio
+import heapq
+import logging
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from tokenizer import normalize_token, tokenize
+
+# Prefixes up to this length match too many terms to scan, so their top completions are kept precomputed
+SHORT_PREFIX = 2
+SHORT_PREFIX_TOP = 32
+# Longer prefixes scan at most this many terms from the sorted array
+SUGGEST_SCAN_LIMIT = 2000
+
+class SuggestIndex:
+    """Prefix completions over title words, keywords and tags
+
+    Terms live in a sorted array (binary search to the prefix, then a bounded forward scan) with
+    their document counts in a dict. Counts only ever grow, which lets the top completions of every
+    one- and two-character prefix be maintained exactly as documents are added.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._terms: List[str] = []
+        self._counts: Dict[str, int] = {}
+        self._tags = set()
+        self._short_top: Dict[str, Dict[str, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _bump(self, term: str, count: int):
+        total = self._counts.get(term, 0) + count
+        if term not in self._counts:
+            insort(self._terms, term)
+        self._counts[term] = total
+        for length in range(1, min(SHORT_PREFIX, len(term)) + 1):
+            top = self._short_top.setdefault(term[:length], {})
+            if term in top or len(top) < SHORT_PREFIX_TOP:
+                top[term] = total
+                continue
+            weakest = min(top, key=top.get)
+            if total > top[weakest]:
+                del top[weakest]
+                top[term] = total
+
+    def _count_terms(self, docs: Iterable[Dict], counts: Counter):
+        for doc in docs:
+            tags = {normalize_token(tag) for tag in doc.get("tags", []) if tag.strip()}
+            keywords = {normalize_token(keyword) for keyword in doc.get("keywords", []) if keyword.strip()}
+            self._tags.update(tags)
+            counts.update(set(tokenize(doc.get("title") or "")) | keywords | tags)
+
+    def add_documents(self, docs: Iterable[Dict]):
+        """Count the distinct terms of each document's title, keywords and tags"""
+        counts = Counter()
+        self._count_terms(docs, counts)
+        for term, count in counts.items():
+            self._bump(term, count)
+
+    def _load_counts(self, counts: Counter):
+        """Merge bulk counts and rebuild the sorted array and short-prefix tops in one pass"""
+        for term, count in counts.items():
+            self._counts[term] = self._counts.get(term, 0) + count
+        self._terms = sorted(self._counts)
+        by_prefix: Dict[str, List[str]] = {}
+        for term in self._terms:
+            for length in range(1, min(SHORT_PREFIX, len(term)) + 1):
+                by_prefix.setdefault(term[:length], []).append(term)
+        self._short_top = {
+            prefix: {term: self._counts[term] for term in heapq.nlargest(SHORT_PREFIX_TOP, terms, key=self._counts.get)}
+            for prefix, terms in by_prefix.items()
+        }
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Most frequent completions of a prefix"""
+        key = normalize_token(prefix)
+        if not key or limit <= 0:
+            return []
+        if len(key) <= SHORT_PREFIX:
+            candidates = self._short_top.get(key, {}).keys()
+        else:
+            start = bisect_left(self._terms, key)
+            candidates = []
+            for term in self._terms[start:start + SUGGEST_SCAN_LIMIT]:
+                if not term.startswith(key):
+                    break
+                candidates.append(term)
+        best = heapq.nsmallest(limit, candidates, key=lambda term: (-self._counts[term], term))
+        return [
+            {"term": term, "kind": "tag" if term in self._tags else "term", "count": self._counts[term]}
+            for term in best
+        ]
+
+    async def build(self, collections: Iterable):
+        """Load terms from every document created before the build started; later ones arrive through add_documents"""
+        started = datetime.now(timezone.utc)
+        projection = {"_id": 0, "title": 1, "keywords": 1, "tags": 1}
+        counts = Counter()
+        documents = 0
+        for collection in collections:
+            batch = []
+            async for doc in collection.find({"created_at": {"$lte": started}}, projection):
+                batch.append(doc)
+                if len(batch) >= 1000:
+                    self._count_terms(batch, counts)
+                    documents += len(batch)
+                    batch = []
+                    # Yield so requests are served while a large corpus loads
+                    await asyncio.sleep(0)
+            self._count_terms(batch, counts)
+            documents += len(batch)
+        # Documents ingested meanwhile were already added one by one and are kept in the merge
+        self._load_counts(counts)
+        self.ready = True
+        logging.info(f"Suggestion index ready: {len(self._terms)} terms from {documents} documents")
+
+    def start(self, collections: Iterable):
+        if self._task is None:
+            self._task = asyncio.create_task(self.build(list(collections)))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+import unicodedata
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Every process reloads the taxonomy this often, so admin edits made through another worker reach it
+TAXONOMY_REFRESH_SECONDS = int(os.environ.get("TAXONOMY_REFRESH_SECONDS", "60"))
+
+# Default taxonomy: tag -> phrases that imply it (the tag itself is always included)
+DEFAULT_TAXONOMY = {
+    'ai': ['a.i.', 'genai', 'generative ai', 'llm', 'llms', 'large language model', 'large language models'],
+    'artificial': [],
+    'intelligence': [],
+    'machine': [],
+    'learning': ['machine learning', 'deep learning'],
+    'technology': ['technologies'],
+    'tech': ['big tech'],
+    'software': ['saas', 'open source'],
+    'hardware': ['chip', 'chips', 'semiconductor', 'semiconductors', 'gpu', 'gpus'],
+    'cloud': ['cloud computing', 'aws', 'azure', 'google cloud'],
+    'data': ['big data', 'database', 'databases', 'analytics'],
+    'digital': [],
+    'mobile': ['smartphone', 'smartphones', 'android', 'iphone', 'ios'],
+    'app': ['apps'],
+    'programming': ['developer', 'developers', 'coding', 'python', 'javascript', 'rust'],
+    'development': [],
+    'startup': ['startups', 'start-up', 'start-ups', 'founder', 'founders', 'venture capital'],
+    'innovation': [],
+    'blockchain': ['web3'],
+    'crypto': ['cryptocurrency', 'bitcoin', 'ethereum'],
+    'cybersecurity': ['cyber security', 'infosec', 'ransomware', 'malware', 'data breach'],
+    'gaming': ['video game', 'video games', 'esports'],
+}
+
+def _is_word_char(char: str) -> bool:
+    # Indic vowel signs and viramas are combining marks, not alphanumerics, but still part of a word
+    return char.isalnum() or unicodedata.category(char).startswith('M')
+
+class TagMatcher:
+    """Aho-Corasick automaton over taxonomy phrases that tags a text in a single pass"""
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.tag_order = {tag: rank for rank, tag in enumerate(taxonomy)}
+        # Trie as parallel arrays: child transitions, failure links and (phrase length, tag) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[tuple]] = [[]]
+
+        for tag, synonyms in taxonomy.items():
+            for phrase in {tag, *synonyms}:
+                phrase = phrase.strip().lower()
+                if phrase:
+                    self._add(phrase, tag)
+        self._build_failure_links()
+
+    def _add(self, phrase: str, tag: str):
+        node = 0
+        for char in phrase:
+            if char not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[node][char] = len(self._goto) - 1
+            node = self._goto[node][char]
+        self._outputs[node].append((len(phrase), tag))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def tag(self, text: str) -> List[str]:
+        """Tags whose phrases occur in the text as whole words, in taxonomy order"""
+        text = text.lower()
+        found = set()
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if not self._outputs[node]:
+                continue
+            # Only accept matches bounded by non-word characters, so "ai" never matches inside "said"
+            if end + 1 < len(text) and _is_word_char(text[end + 1]):
+                continue
+            for length, tag in self._outputs[node]:
+                start = end - length + 1
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    found.add(tag)
+        return sorted(found, key=self.tag_order.get)
+
+class TaxonomyStore:
+    """Admin-editable taxonomy in Mongo with the compiled matcher cached in memory
+
+    Edits recompile the matcher at once in the process that made them; other processes pick them up
+    within TAXONOMY_REFRESH_SECONDS.
+    """
+
+    def __init__(self, taxonomy_collection, refresh_seconds: int = TAXONOMY_REFRESH_SECONDS):
+        self.collection = taxonomy_collection
+        self.refresh_seconds = refresh_seconds
+        self.taxonomy: Dict[str, List[str]] = dict(DEFAULT_TAXONOMY)
+        self.matcher = TagMatcher(self.taxonomy)
+        self._task: Optional[asyncio.Task] = None
+
+    async def _seed(self):
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne({"tag": tag}, {"$setOnInsert": {"synonyms": synonyms, "rank": rank, "updated_at": now}}, upsert=True)
+            for rank, (tag, synonyms) in enumerate(DEFAULT_TAXONOMY.items())
+        ]
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Workers starting together race on the unique tag index; whoever lost finds the tags already there
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != 11000 for err in errors):
+                raise
+
+    async def load(self):
+        """Load the taxonomy (seeding the defaults on first run) and recompile the matcher if it changed"""
+        docs = await self.collection.find({}, {"_id": 0}).sort("rank", 1).to_list(None)
+        if not docs:
+            await self._seed()
+            docs = await self.collection.find({}, {"_id": 0}).sort("rank", 1).to_list(None)
+        taxonomy = {doc["tag"]: doc.get("synonyms", []) for doc in docs}
+        if taxonomy != self.taxonomy:
+            self.matcher = TagMatcher(taxonomy)
+        self.taxonomy = taxonomy
+
+    def start(self):
+        """Start reloading the taxonomy in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Taxonomy refresh failed: {str(e)}")
+
+    async def upsert(self, tag: str, synonyms: List[str]):
+        tag = tag.strip().lower()
+        rank = len(self.taxonomy) if tag not in self.taxonomy else list(self.taxonomy).index(tag)
+        await self.collection.update_one(
+            {"tag": tag},
+            {"$set": {"synonyms": [s.strip().lower() for s in synonyms if s.strip()], "updated_at": datetime.now(timezone.utc)},
+             "$setOnInsert": {"rank": rank}},
+            upsert=True
+        )
+        await self.load()
+
+    async def delete(self, tag: str) -> bool:
+        result = await self.collection.delete_one({"tag": tag.strip().lower()})
+        await self.load()
+        return result.deleted_count > 0
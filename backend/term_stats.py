@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from tokenizer import tokenize
+
+# Term statistics configuration
+TERM_STATS_REFRESH_SECONDS = int(os.environ.get("TERM_STATS_REFRESH_SECONDS", "300"))
+# Terms seen in a single document are left out of the snapshot to bound its memory and count as unseen
+TERM_STATS_MIN_DF = int(os.environ.get("TERM_STATS_MIN_DF", "2"))
+DOCUMENT_COUNT_TERM = "__documents__"
+
+class TermStatsSnapshot:
+    """Immutable view of corpus document frequencies used for IDF weighting"""
+
+    def __init__(self, documents: int = 0, frequencies: Optional[Dict[str, int]] = None):
+        self.documents = documents
+        self.frequencies = frequencies or {}
+
+    def document_frequency(self, term: str) -> int:
+        return self.frequencies.get(term, 0)
+
+class TermStatistics:
+    """Corpus document frequencies in Mongo, updated incrementally, with a periodically refreshed snapshot"""
+
+    def __init__(self, stats_collection, refresh_seconds: int = TERM_STATS_REFRESH_SECONDS):
+        self.collection = stats_collection
+        self.refresh_seconds = refresh_seconds
+        self.snapshot = TermStatsSnapshot()
+        self._task: Optional[asyncio.Task] = None
+
+    async def record(self, texts: List[str]):
+        """Add documents to the corpus counts with one batched $inc upsert per distinct term"""
+        if not texts:
+            return
+        frequencies = Counter()
+        for text in texts:
+            frequencies.update(set(tokenize(text)))
+
+        operations = [UpdateOne({"term": DOCUMENT_COUNT_TERM}, {"$inc": {"df": len(texts)}}, upsert=True)]
+        operations.extend(
+            UpdateOne({"term": term}, {"$inc": {"df": count}}, upsert=True)
+            for term, count in frequencies.items()
+        )
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Two feeds inserting the same new term can race on the unique index; the counts are approximate anyway
+            logging.warning(f"Term statistics update skipped {len(e.details.get('writeErrors', []))} terms")
+
+    async def refresh(self):
+        """Reload the in-process snapshot from Mongo"""
+        documents = await self.collection.find_one({"term": DOCUMENT_COUNT_TERM})
+        cursor = self.collection.find({"df": {"$gte": TERM_STATS_MIN_DF}}, {"_id": 0, "term": 1, "df": 1})
+        frequencies = {doc["term"]: doc["df"] async for doc in cursor if doc["term"] != DOCUMENT_COUNT_TERM}
+        self.snapshot = TermStatsSnapshot(documents["df"] if documents else 0, frequencies)
+
+    def start(self):
+        """Start refreshing the snapshot in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Term statistics refresh failed: {str(e)}")
+            await asyncio.sleep(self.refresh_seconds)
@@ -0,0 +1,51 @@
+import re
+from typing import Dict, List, Optional
+
+from tokenizer import normalize_token
+
+# Field weights of the single text index each collection may have; a title hit outranks a body hit
+ARTICLE_TEXT_WEIGHTS = {"title": 10, "keywords": 5, "tags": 5, "summary": 3, "content": 1}
+CONTENT_TEXT_WEIGHTS = {"title": 10, "keywords": 5, "tags": 5, "summary": 3, "content": 1}
+TEXT_INDEX_NAME = "text_search"
+MAX_QUERY_TERMS = 16
+
+# Characters the $text parser treats as operators (phrases, negation) or that only split words anyway
+_QUERY_SEPARATORS = re.compile(r'["\\\-\s]+')
+
+async def ensure_text_index(collection, weights: Dict[str, int]):
+    """Create the weighted text index; "none" turns off stemming and stop words, which are English-only"""
+    await collection.create_index(
+        [(field, "text") for field in weights],
+        weights=weights,
+        default_language="none",
+        # Generated content has its own "language" field ("hindi", ...), which Mongo would otherwise read
+        language_override="text_language",
+        name=TEXT_INDEX_NAME,
+    )
+
+def text_search_terms(query: str) -> List[str]:
+    """User query as plain $text terms: raw words plus their normalized forms, with no operators"""
+    terms = []
+    for word in _QUERY_SEPARATORS.split(query):
+        for term in (word, normalize_token(word)):
+            if term and term not in terms:
+                terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+def text_search_filter(query: str) -> Optional[Dict]:
+    """$text filter matching any of the query's terms, or None when nothing searchable is left"""
+    terms = text_search_terms(query)
+    if not terms:
+        return None
+    return {"$text": {"$search": " ".join(terms)}}
+
+async def text_search(collection, query: str, limit: int, extra: Optional[Dict] = None) -> List[Dict]:
+    """Documents matching the query through the text index, best relevance first, newest on ties"""
+    search = text_search_filter(query)
+    if search is None or limit <= 0:
+        return []
+    if extra:
+        search = {**search, **extra}
+    cursor = collection.find(search, {"score": {"$meta": "textScore"}})
+    cursor = cursor.sort([("score", {"$meta": "textScore"}), ("created_at", -1)]).limit(limit)
+    return await cursor.to_list(limit)
@@ -0,0 +1,67 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+# One pattern per supported script. Indic ranges exclude the danda punctuation and native digits,
+# and include the vowel signs (matras) and viramas that Python's \w would split words on.
+TOKEN_PATTERN = re.compile(
+    r"(?P<latin>\b[a-z]{4,}\b)"
+    "|(?P<devanagari>[\u0900-\u0963\u0970-\u097f]{2,})"
+    "|(?P<bengali>[\u0980-\u09e5\u09f0-\u09ff]{2,})"
+)
+
+ENGLISH_STOPWORDS = frozenset([
+    'this', 'that', 'with', 'have', 'will', 'from', 'they', 'been', 'were', 'said', 'each', 'which', 'their',
+    'time', 'would', 'there', 'could', 'more', 'than', 'into', 'very', 'what', 'know', 'just', 'first', 'also',
+    'after', 'back', 'other', 'many', 'them', 'these', 'some', 'like', 'even', 'most', 'made', 'only', 'over',
+    'think', 'where', 'being', 'through', 'much', 'before', 'right', 'should', 'still', 'such', 'between',
+    'both', 'under', 'never', 'while', 'another', 'without', 'again', 'come', 'make', 'then'
+])
+
+HINDI_STOPWORDS = frozenset([
+    'और', 'का', 'की', 'के', 'को', 'में', 'से', 'पर', 'है', 'हैं', 'था', 'थे', 'थी', 'हो', 'होता', 'होती', 'होते',
+    'हुआ', 'हुई', 'हुए', 'एक', 'यह', 'वह', 'ये', 'वे', 'इस', 'उस', 'इन', 'उन', 'इसके', 'उसके', 'इसमें', 'जो',
+    'कि', 'तो', 'भी', 'ही', 'नहीं', 'न', 'लिए', 'साथ', 'द्वारा', 'कर', 'करने', 'करता', 'करती', 'करते', 'किया',
+    'किए', 'गया', 'गई', 'गए', 'रहा', 'रही', 'रहे', 'सकता', 'सकती', 'सकते', 'जा', 'जाता', 'जाती', 'अपने', 'अपनी',
+    'आप', 'हम', 'मैं', 'या', 'लेकिन', 'अगर', 'जब', 'तक', 'बहुत', 'सभी', 'कुछ', 'अब', 'वाले', 'वाली', 'बाद'
+])
+
+BANGLA_STOPWORDS = frozenset([
+    'এবং', 'ও', 'এর', 'একটি', 'এক', 'এই', 'সেই', 'যে', 'যা', 'তা', 'করে', 'করা', 'করেন', 'করতে', 'হয়', 'হবে',
+    'হয়েছে', 'ছিল', 'আছে', 'থেকে', 'জন্য', 'দিয়ে', 'সঙ্গে', 'সাথে', 'না', 'নয়', 'কিন্তু', 'বা', 'যদি', 'তবে',
+    'আর', 'তার', 'তাদের', 'আমরা', 'আমি', 'আপনি', 'তিনি', 'তারা', 'কি', 'কোন', 'সব', 'কিছু', 'অনেক', 'এখন',
+    'পর', 'পরে', 'মধ্যে', 'উপর', 'দ্বারা', 'হিসেবে', 'বলে', 'গেছে', 'হলো', 'হল', 'যায়', 'নিয়ে', 'এটি', 'ওই'
+])
+
+# Zero-width joiners carry no meaning for matching, Hindi writers apply the nukta inconsistently
+# (Bengali nukta letters such as য় are distinct letters and are kept), and candrabindu/anusvara
+# are used interchangeably in casual Hindi and Bangla
+INDIC_NORMALIZATION = str.maketrans({
+    '\u200c': None, '\u200d': None,  # ZWNJ, ZWJ
+    '\u093c': None,  # Devanagari nukta
+    '\u0901': '\u0902', '\u0981': '\u0982',  # candrabindu -> anusvara
+})
+
+@lru_cache(maxsize=65536)
+def normalize_token(token: str) -> str:
+    """NFC-normalized, lowercased token with Indic spelling variants folded together"""
+    token = unicodedata.normalize("NFC", token.strip().lower())
+    if token.isascii():
+        return token
+    # NFC keeps nukta letters like क़ decomposed (composition exclusions), so the nukta can be dropped here
+    return unicodedata.normalize("NFC", unicodedata.normalize("NFD", token).translate(INDIC_NORMALIZATION))
+
+def _normalized_text(text: str) -> str:
+    return unicodedata.normalize("NFC", text.lower())
+
+STOPWORDS = frozenset(normalize_token(word) for word in ENGLISH_STOPWORDS | HINDI_STOPWORDS | BANGLA_STOPWORDS)
+
+def tokenize(text: str) -> List[str]:
+    """Keyword candidates in English, Hindi and Bangla, normalized and with each script's stopwords removed"""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(_normalized_text(text)):
+        token = normalize_token(match.group())
+        if token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
@@ -0,0 +1,202 @@
+import hashlib
+import os
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pymongo import UpdateOne
+
+# Sketch configuration
+TREND_BUCKET_SECONDS = 600  # 10-minute buckets
+TREND_RETENTION_HOURS = int(os.environ.get("TREND_RETENTION_HOURS", "48"))
+CMS_DEPTH = 4
+CMS_WIDTH = 2048
+HEAVY_HITTERS = 100  # Space-Saving counters kept per bucket and scope in each process
+TREND_WINDOWS = {"1h": 3600, "24h": 86400}
+# Buckets older than this many buckets before the current one no longer receive writes and are cached
+TREND_SETTLE_BUCKETS = 1
+# Scopes (categories) whose sketches are cached per process; the least recently queried is dropped first
+TREND_MAX_CACHED_SCOPES = int(os.environ.get("TREND_MAX_CACHED_SCOPES", "32"))
+ALL_CATEGORIES = "all"
+
+@lru_cache(maxsize=65536)
+def _cms_columns(term: str) -> Tuple[int, ...]:
+    # Double hashing from one stable digest, so every process maps a term to the same cells
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    return tuple((h1 + row * h2) % CMS_WIDTH for row in range(CMS_DEPTH))
+
+def bucket_of(moment: datetime) -> int:
+    return int(moment.timestamp()) // TREND_BUCKET_SECONDS
+
+class SpaceSaving:
+    """Bounded heavy-hitter counters (Space-Saving): the top terms survive, rare ones are evicted"""
+
+    def __init__(self, capacity: int = HEAVY_HITTERS):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+
+    def add(self, term: str, count: int = 1):
+        if term in self.counts or len(self.counts) < self.capacity:
+            self.counts[term] = self.counts.get(term, 0) + count
+            return
+        # Replace the smallest counter; the newcomer inherits its count as an upper bound
+        smallest = min(self.counts, key=self.counts.get)
+        floor = self.counts.pop(smallest)
+        self.counts[term] = floor + count
+
+def _sparse_bucket(doc: Dict) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """A bucket document as (flat sketch cells, their counts, candidate terms)"""
+    cells: List[int] = []
+    counts: List[int] = []
+    for row, columns in doc.get("cms", {}).items():
+        base = int(row) * CMS_WIDTH
+        cells.extend(base + int(column) for column in columns)
+        counts.extend(columns.values())
+    return np.array(cells, dtype=np.int64), np.array(counts, dtype=np.int64), list(doc.get("candidates", {}))
+
+EMPTY_BUCKET = _sparse_bucket({})
+
+class _WindowSketch:
+    """Merged sketch and candidate counts of the settled buckets first..last of one window and scope"""
+
+    def __init__(self):
+        self.sketch = np.zeros((CMS_DEPTH, CMS_WIDTH), dtype=np.int64)
+        self.candidates: Counter = Counter()
+        self.first: Optional[int] = None
+        self.last: Optional[int] = None
+        self.buckets = 0
+
+    def apply(self, bucket: Tuple[np.ndarray, np.ndarray, List[str]], sign: int):
+        cells, counts, candidates = bucket
+        if not len(cells) and not candidates:
+            return
+        # Cells are unique within a bucket, so fancy-index addition is exact
+        self.sketch.reshape(-1)[cells] += sign * counts
+        for term in candidates:
+            self.candidates[term] += sign
+            if self.candidates[term] <= 0:
+                del self.candidates[term]
+        self.buckets += sign
+
+class TrendingSketches:
+    """Per-bucket count-min sketches and heavy-hitter candidates of article terms, persisted in Mongo
+
+    Each bucket document holds a sparse count-min sketch (updated with atomic $inc, so several
+    processes can write to the same bucket) and a bounded set of candidate terms. Queries sum the
+    sketches of the buckets in the window and rank the candidates by their estimated counts.
+
+    Settled buckets never change, so each process keeps them in sparse form together with a merged
+    sketch per window and scope; a query only fetches the open buckets and those settled since the
+    last query, then slides the merged sketch forward.
+    """
+
+    def __init__(self, buckets_collection):
+        self.collection = buckets_collection
+        self._heavy_hitters: Dict[Tuple[int, str], SpaceSaving] = {}
+        self._settled: Dict[Tuple[int, str], Tuple[np.ndarray, np.ndarray, List[str]]] = {}
+        self._windows: Dict[Tuple[str, str], _WindowSketch] = {}
+        # Scopes in least recently queried order; categories come from the query string, so this is bounded
+        self._scopes: "OrderedDict[str, None]" = OrderedDict()
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("created_at", expireAfterSeconds=TREND_RETENTION_HOURS * 3600)
+
+    async def record(self, category: str, term_lists: Iterable[Iterable[str]], now: Optional[datetime] = None):
+        """Count each article's distinct terms in the current bucket, for its category and overall"""
+        now = now or datetime.now(timezone.utc)
+        bucket = bucket_of(now)
+        counts = Counter()
+        for terms in term_lists:
+            counts.update(term for term in set(terms) if term and "." not in term and not term.startswith("$"))
+        if not counts:
+            return
+
+        self._heavy_hitters = {key: hh for key, hh in self._heavy_hitters.items() if key[0] >= bucket - 1}
+        operations = []
+        for scope in {ALL_CATEGORIES, category}:
+            heavy_hitters = self._heavy_hitters.setdefault((bucket, scope), SpaceSaving())
+            increments = Counter()
+            for term, count in counts.items():
+                heavy_hitters.add(term, count)
+                for row, column in enumerate(_cms_columns(term)):
+                    increments[f"cms.{row}.{column}"] += count
+            update = {
+                "$inc": dict(increments),
+                "$setOnInsert": {"bucket": bucket, "scope": scope, "created_at": now},
+            }
+            # Only terms currently in this process's heavy hitters become candidates, bounding the document
+            candidates = {f"candidates.{term}": True for term in counts if term in heavy_hitters.counts}
+            if candidates:
+                update["$set"] = candidates
+            operations.append(UpdateOne({"_id": f"{bucket}:{scope}"}, update, upsert=True))
+        await self.collection.bulk_write(operations, ordered=False)
+
+    def _touch_scope(self, scope: str):
+        self._scopes[scope] = None
+        self._scopes.move_to_end(scope)
+        while len(self._scopes) > TREND_MAX_CACHED_SCOPES:
+            evicted, _ = self._scopes.popitem(last=False)
+            self._windows = {key: merged for key, merged in self._windows.items() if key[1] != evicted}
+            self._settled = {key: bucket for key, bucket in self._settled.items() if key[1] != evicted}
+
+    async def top(self, window: str, category: Optional[str] = None, limit: int = 20,
+                  now: Optional[datetime] = None) -> Dict:
+        """Top terms over the trailing window, answered from the bucket sketches alone"""
+        seconds = TREND_WINDOWS[window]
+        scope = category or ALL_CATEGORIES
+        current = bucket_of(now or datetime.now(timezone.utc))
+        first = current - seconds // TREND_BUCKET_SECONDS + 1
+        last_settled = current - TREND_SETTLE_BUCKETS - 1
+        open_buckets = range(max(first, last_settled + 1), current + 1)
+        missing = [bucket for bucket in range(first, last_settled + 1) if (bucket, scope) not in self._settled]
+        docs = await self.collection.find(
+            {"_id": {"$in": [f"{bucket}:{scope}" for bucket in [*missing, *open_buckets]]}},
+            {"bucket": 1, "cms": 1, "candidates": 1}
+        ).to_list(None)
+        fetched = {doc["bucket"]: _sparse_bucket(doc) for doc in docs}
+        self._touch_scope(scope)
+        for bucket in missing:
+            self._settled[(bucket, scope)] = fetched.get(bucket, EMPTY_BUCKET)
+
+        merged = self._windows.get((window, scope))
+        if (merged is None or first < merged.first or last_settled < merged.last or first > merged.last + 1
+                or any((bucket, scope) not in self._settled for bucket in range(merged.first, first))):
+            # First query, a gap since the last one, or expired buckets already dropped: rebuild from the cache
+            merged = self._windows[(window, scope)] = _WindowSketch()
+            for bucket in range(first, last_settled + 1):
+                merged.apply(self._settled.get((bucket, scope), EMPTY_BUCKET), 1)
+        else:
+            for bucket in range(merged.first, first):
+                merged.apply(self._settled[(bucket, scope)], -1)
+            for bucket in range(merged.last + 1, last_settled + 1):
+                merged.apply(self._settled.get((bucket, scope), EMPTY_BUCKET), 1)
+        merged.first, merged.last = first, last_settled
+
+        # Buckets that slid out of the longest window are no longer needed by any query
+        oldest = current - max(TREND_WINDOWS.values()) // TREND_BUCKET_SECONDS
+        if any(bucket < oldest for bucket, _ in self._settled):
+            self._settled = {key: value for key, value in self._settled.items() if key[0] >= oldest}
+
+        sketch = merged.sketch.copy()
+        candidates = set(merged.candidates)
+        buckets = merged.buckets
+        for bucket in open_buckets:
+            if bucket in fetched:
+                cells, cell_counts, bucket_terms = fetched[bucket]
+                sketch.reshape(-1)[cells] += cell_counts
+                candidates.update(bucket_terms)
+                buckets += 1
+
+        terms = list(candidates)
+        if terms:
+            columns = np.array([_cms_columns(term) for term in terms], dtype=np.int64)
+            counts = sketch[np.arange(CMS_DEPTH), columns].min(axis=1).tolist()
+        else:
+            counts = []
+        estimates = [{"term": term, "count": count} for term, count in zip(terms, counts)]
+        estimates.sort(key=lambda item: (-item["count"], item["term"]))
+        return {"window": window, "category": category, "buckets": buckets, "terms": estimates[:limit]}
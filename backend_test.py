@@ -160,6 +160,25 @@ class TechPulseAPITester:
             self.log_test("Collect Articles", False, f"Exception: {str(e)}")
             return False, {}
 
+    def test_collection_run(self, job_id):
+        """Test reading the progress summary of a collection run"""
+        try:
+            response = requests.get(f"{self.api_url}/articles/collect/{job_id}", timeout=10)
+            success = response.status_code == 200
+            data = response.json() if success else {}
+            
+            if success and data.get("id") == job_id and "totals" in data:
+                self.log_test("Collection Run Status", True, 
+                            f"Status: {data.get('status')}, Feeds done: {data.get('feeds_done')}/{data.get('feeds_total')}",
+                            response_data={"status": data.get("status"), "totals": data.get("totals")})
+                return True, data
+            else:
+                self.log_test("Collection Run Status", False, f"Status: {response.status_code}, Response: {data}")
+                return False, data
+        except Exception as e:
+            self.log_test("Collection Run Status", False, f"Exception: {str(e)}")
+            return False, {}
+
     def test_get_articles(self):
         """Test getting collected articles"""
         try:
@@ -206,6 +225,33 @@ class TechPulseAPITester:
             self.log_test(f"Generate Content ({language})", False, f"Exception: {str(e)}")
             return False, {}
 
+    def test_generation_job(self):
+        """Test queued content generation: submit a job, then poll until it finishes"""
+        try:
+            payload = {"topics": ["technology"], "language": "english", "article_count": 3}
+            response = requests.post(f"{self.api_url}/generate/jobs", json=payload,
+                                   headers=self.get_auth_headers(), timeout=10)
+            if response.status_code != 200:
+                self.log_test("Generation Job", False, f"Status: {response.status_code}, Response: {response.text}")
+                return False, {}
+            job_id = response.json()["job_id"]
+            
+            data = {}
+            for _ in range(30):
+                time.sleep(2)
+                data = requests.get(f"{self.api_url}/generate/jobs/{job_id}",
+                                  headers=self.get_auth_headers(), timeout=10).json()
+                if data.get("status") in ("completed", "failed"):
+                    break
+            
+            success = data.get("status") == "completed" and bool(data.get("result"))
+            self.log_test("Generation Job", success, f"Job {job_id}: {data.get('status')} {data.get('error') or ''}",
+                        response_data={"status": data.get("status"), "attempts": data.get("attempts")})
+            return success, data
+        except Exception as e:
+            self.log_test("Generation Job", False, f"Exception: {str(e)}")
+            return False, {}
+
     def test_get_generated_content(self):
         """Test getting generated content"""
         try:
@@ -287,6 +333,64 @@ class TechPulseAPITester:
             self.log_test("Search", False, f"Exception: {str(e)}")
             return False, {}
 
+    def test_semantic_search(self):
+        """Test semantic search over the local embedding index"""
+        try:
+            response = requests.get(f"{self.api_url}/search?q=artificial intelligence startups&mode=semantic&limit=5", timeout=10)
+            success = response.status_code == 200
+            data = response.json() if success else {}
+            
+            if success and isinstance(data, dict):
+                articles_count = len(data.get("articles", []))
+                content_count = len(data.get("generated_content", []))
+                self.log_test("Semantic Search", True, f"Found {articles_count} articles, {content_count} generated content",
+                            response_data={"articles": articles_count, "generated_content": content_count})
+                return True, data
+            else:
+                self.log_test("Semantic Search", False, f"Status: {response.status_code}, Response: {data}")
+                return False, data
+        except Exception as e:
+            self.log_test("Semantic Search", False, f"Exception: {str(e)}")
+            return False, {}
+
+    def test_search_suggest(self):
+        """Test search-as-you-type completions"""
+        try:
+            response = requests.get(f"{self.api_url}/search/suggest?q=tech&limit=5", timeout=10)
+            success = response.status_code == 200
+            data = response.json() if success else {}
+            
+            if success and isinstance(data.get("suggestions"), list):
+                texts = [item["text"] for item in data["suggestions"]]
+                self.log_test("Search Suggestions", True, f"Suggestions: {texts}",
+                            response_data={"suggestions": len(texts)})
+                return True, data
+            else:
+                self.log_test("Search Suggestions", False, f"Status: {response.status_code}, Response: {data}")
+                return False, data
+        except Exception as e:
+            self.log_test("Search Suggestions", False, f"Exception: {str(e)}")
+            return False, {}
+
+    def test_trending(self):
+        """Test trending topics from the time-bucketed sketches"""
+        try:
+            response = requests.get(f"{self.api_url}/trending?window=24h&limit=10", timeout=10)
+            success = response.status_code == 200
+            data = response.json() if success else {}
+            
+            if success and isinstance(data.get("terms"), list):
+                top_terms = [item["term"] for item in data["terms"][:5]]
+                self.log_test("Trending Topics", True, f"Top terms: {top_terms}",
+                            response_data={"buckets": data.get("buckets"), "terms": len(data["terms"])})
+                return True, data
+            else:
+                self.log_test("Trending Topics", False, f"Status: {response.status_code}, Response: {data}")
+                return False, data
+        except Exception as e:
+            self.log_test("Trending Topics", False, f"Exception: {str(e)}")
+            return False, {}
+
     def run_comprehensive_test(self):
         """Run all tests in sequence"""
         print("🚀 Starting TechPulse AI Backend API Tests")
@@ -319,6 +423,7 @@ class TechPulseAPITester:
         if collect_success:
             print("⏳ Waiting 5 seconds for article collection...")
             time.sleep(5)
+            self.test_collection_run(collect_data.get("job_id"))
         
         articles_success, articles_data = self.test_get_articles()
         
@@ -336,6 +441,7 @@ class TechPulseAPITester:
             self.test_generate_content("hindi")
             time.sleep(3)
             self.test_generate_content("bangla")
+            self.test_generation_job()
         
         # Content Management Tests
         print("\n📄 Testing Content Management...")
@@ -350,6 +456,9 @@ class TechPulseAPITester:
         print("\n📊 Testing Analytics and Search...")
         self.test_analytics()
         self.test_search()
+        self.test_semantic_search()
+        self.test_search_suggest()
+        self.test_trending()
         
         return True
 
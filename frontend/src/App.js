@@ -1131,11 +1131,20 @@ const Dashboard = () => {
   const collectArticles = async () => {
     try {
       const token = localStorage.getItem('token');
-      await axios.post(`${API}/articles/collect`, {}, {
+      const response = await axios.post(`${API}/articles/collect`, {}, {
         headers: { Authorization: `Bearer ${token}` }
       });
       toast.success('Article collection started in background');
-      setTimeout(fetchAnalytics, 3000);
+
+      // Follow the run's progress stream instead of guessing when it finishes
+      const events = new EventSource(`${API}/articles/collect/${response.data.job_id}/events`);
+      events.addEventListener('run_done', (event) => {
+        const run = JSON.parse(event.data);
+        events.close();
+        fetchAnalytics();
+        toast.success(`Collected ${run.totals.inserted} new articles from ${run.feeds_total} feeds in ${Math.round(run.elapsed)}s`);
+      });
+      events.onerror = () => events.close();
     } catch (error) {
       toast.error('Failed to start article collection');
     }
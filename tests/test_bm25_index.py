@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from bm25_index import BM25Index, decode_varints, encode_varint
+
+DOCS = [
+    ("a1", "Rust compiler release speeds up incremental builds"),
+    ("a2", "Python packaging tools converge on a standard lockfile"),
+    ("a3", "Rust and Python bindings make native extensions easier"),
+    ("a4", "Quantum hardware startups raise record funding"),
+]
+
+def test_varints_round_trip():
+    values = [0, 1, 127, 128, 300, 16383, 16384, 2 ** 31, 2 ** 40 + 5]
+    buffer = bytearray()
+    for value in values:
+        encode_varint(buffer, value)
+    assert buffer[:3] == bytes([0, 1, 127])
+    assert decode_varints(bytes(buffer)).tolist() == values
+    assert len(decode_varints(b"")) == 0
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "bm25.idx"
+    index = BM25Index(str(path))
+    created_at = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    for i, (doc_id, text) in enumerate(DOCS):
+        index.add("articles" if i % 2 else "content", doc_id, text, created_at + timedelta(minutes=i))
+    asyncio.run(index.save())
+
+    restored = BM25Index(str(path))
+    assert restored.load()
+    assert restored.doc_ids == index.doc_ids
+    assert restored._watermark == created_at + timedelta(minutes=3)
+    for query in ["rust", "python bindings", "funding", "missing"]:
+        for kind in [None, "articles", "content"]:
+            assert restored.search(query, 10, kind) == index.search(query, 10, kind)
+
+    # Documents added after loading extend the memory-mapped postings and survive the next snapshot
+    restored.add("articles", "a5", "Rust rewrite of the Python packaging resolver")
+    asyncio.run(restored.save())
+    again = BM25Index(str(path))
+    assert again.load()
+    assert again.search("rust packaging", 10) == restored.search("rust packaging", 10)
+    docs, freqs = again._postings["rust"].decode()
+    assert docs.tolist() == [0, 2, 4] and freqs.tolist() == [1, 1, 1]
+    assert np.array_equal(again._lengths[:5], restored._lengths[:5])
+
+def test_missing_snapshot_is_not_loaded(tmp_path):
+    assert not BM25Index(str(tmp_path / "missing.idx")).load()
+
+class _Cursor:
+    def __init__(self, docs, gate):
+        self.docs = docs
+        self.gate = gate
+
+    def sort(self, *args):
+        return self
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            await self.gate.wait()
+            yield doc
+
+class _Collection:
+    def __init__(self, docs, gate):
+        self.docs = docs
+        self.gate = gate
+
+    def find(self, query, projection):
+        return _Cursor(self.docs, self.gate)
+
+def test_build_runs_in_background_and_accepts_ingestion(tmp_path):
+    async def run():
+        gate = asyncio.Event()
+        articles = _Collection([{"id": doc_id, "title": text} for doc_id, text in DOCS], gate)
+        index = BM25Index(str(tmp_path / "bm25.idx"))
+        index.start(articles, _Collection([], gate))
+        await asyncio.sleep(0.05)
+        # Still reading from Mongo: not searchable yet, but ingestion is already indexed
+        assert not index.ready
+        index.add_documents("articles", [{"id": "new", "title": "Rust ships a new borrow checker"}])
+        gate.set()
+        while not index.ready:
+            await asyncio.sleep(0.01)
+        assert len(index) == len(DOCS) + 1
+        assert {doc_id for doc_id, _ in index.search("rust", 10)} == {"a1", "a3", "new"}
+        await index.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+from circuit_breaker import (FEED_BREAKER_BASE_DELAY, FEED_BREAKER_MAX_DELAY, FEED_BREAKER_THRESHOLD,
+                             breaker_allows, breaker_update)
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+def _delay(update):
+    return (update["retry_at"] - NOW).total_seconds()
+
+def test_circuit_stays_closed_below_threshold():
+    update = breaker_update({"consecutive_failures": FEED_BREAKER_THRESHOLD - 2}, "timeout", NOW)
+    assert update["circuit_state"] == "closed" and update["retry_at"] is None
+
+def test_backoff_doubles_with_jitter_and_is_capped():
+    delays = [
+        _delay(breaker_update({"consecutive_failures": FEED_BREAKER_THRESHOLD - 1 + extra}, "timeout", NOW))
+        for extra in range(3)
+    ]
+    for extra, delay in enumerate(delays):
+        expected = FEED_BREAKER_BASE_DELAY * 2 ** extra
+        assert 0.9 * expected <= delay <= 1.1 * expected
+    capped = breaker_update({"consecutive_failures": 50}, "timeout", NOW)
+    assert _delay(capped) <= 1.1 * FEED_BREAKER_MAX_DELAY
+
+def test_open_circuit_allows_fetch_once_retry_time_passes():
+    feed = {"consecutive_failures": FEED_BREAKER_THRESHOLD, "retry_at": NOW.replace(tzinfo=None)}
+    assert not breaker_allows(feed, NOW - timedelta(seconds=1))
+    assert breaker_allows(feed, NOW)
+
+def test_success_closes_the_circuit():
+    assert breaker_update({"consecutive_failures": 9}, None, NOW) == {
+        "consecutive_failures": 0, "circuit_state": "closed", "retry_at": None
+    }
@@ -0,0 +1,37 @@
+from feed_parser import parse_feed_entries
+
+def _rss(items):
+    entries = "".join(
+        f"<item><guid>{guid}</guid><title>Story {guid}</title><link>https://example.com/{guid}</link>"
+        f"<pubDate>{published}</pubDate></item>"
+        for guid, published in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{entries}</channel></rss>'.encode()
+
+A = ("a", "Tue, 10 Mar 2026 12:00:00 GMT")
+B = ("b", "Tue, 10 Mar 2026 11:00:00 GMT")
+C = ("c", "Tue, 10 Mar 2026 10:00:00 GMT")
+
+def _titles(result):
+    return [article["title"] for article in result["articles"]]
+
+def test_first_fetch_returns_every_entry():
+    result = parse_feed_entries(_rss([A, B]))
+    assert _titles(result) == ["Story a", "Story b"]
+    assert result["watermark"]["last_entry_ids"] == ["a", "b"]
+
+def test_reordered_feed_keeps_new_older_entry():
+    first = parse_feed_entries(_rss([A, B]))["watermark"]
+    second = parse_feed_entries(_rss([A, C, B]), known_ids=first["last_entry_ids"], since=first["last_published_at"])
+    assert _titles(second) == ["Story c"]
+    assert second["watermark"]["last_entry_ids"] == ["a", "c", "b"]
+
+def test_unchanged_feed_returns_nothing():
+    first = parse_feed_entries(_rss([A, B]))["watermark"]
+    again = parse_feed_entries(_rss([B, A]), known_ids=first["last_entry_ids"], since=first["last_published_at"])
+    assert again["articles"] == []
+
+def test_published_watermark_applies_without_stored_ids():
+    first = parse_feed_entries(_rss([A, B]))["watermark"]
+    result = parse_feed_entries(_rss([A, C]), since=first["last_published_at"])
+    assert result["articles"] == []
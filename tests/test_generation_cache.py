@@ -0,0 +1,34 @@
+import generation_cache
+from generation_cache import GenerationCache, generation_cache_key
+
+def test_key_ignores_article_order_but_not_settings():
+    key = generation_cache_key(["b", "a"], "english", "professional", "medium", True, 1)
+    assert key == generation_cache_key(["a", "b"], "english", "professional", "medium", True, 1)
+    assert key != generation_cache_key(["a", "b"], "hindi", "professional", "medium", True, 1)
+    assert key != generation_cache_key(["a", "b"], "english", "professional", "medium", True, 2)
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(generation_cache.time, "monotonic", lambda: clock[0])
+    cache = GenerationCache(ttl_seconds=60, max_entries=10)
+    cache.put("k", "value")
+    clock[0] += 59
+    assert cache.get("k") == "value"
+    clock[0] += 2
+    assert cache.get("k") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = GenerationCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+def test_disabled_cache_stores_nothing():
+    cache = GenerationCache(ttl_seconds=0, max_entries=10)
+    cache.put("a", 1)
+    assert cache.get("a") is None
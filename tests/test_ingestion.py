@@ -0,0 +1,16 @@
+from ingestion import normalize_url, url_hash
+
+def test_tracking_parameters_and_fragment_are_dropped():
+    url = "https://example.com/story?utm_source=x&id=7&fbclid=abc#comments"
+    assert normalize_url(url) == "https://example.com/story?id=7"
+
+def test_scheme_host_default_port_and_trailing_slash():
+    assert normalize_url(" HTTPS://Example.COM:443/News/ ") == "https://example.com/News"
+    assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+def test_query_order_does_not_matter():
+    assert normalize_url("https://example.com/a?b=2&a=1") == normalize_url("https://example.com/a?a=1&b=2")
+
+def test_url_hash_matches_equivalent_urls_only():
+    assert url_hash("https://example.com/a/?utm_medium=rss") == url_hash("https://EXAMPLE.com/a")
+    assert url_hash("https://example.com/a") != url_hash("https://example.com/b")
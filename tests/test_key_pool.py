@@ -0,0 +1,121 @@
+import asyncio
+import copy
+
+from key_pool import KeyPool
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    async def to_list(self, length):
+        return self.docs
+
+class _KeysCollection:
+    """In-memory stand-in for api_keys that evaluates the lease and return pipelines KeyPool sends"""
+
+    def __init__(self, keys):
+        self.keys = {key["id"]: key for key in keys}
+        self.round_trips = 0
+
+    def find(self, query, projection):
+        self.round_trips += 1
+        return _Cursor([copy.deepcopy(key) for key in self.keys.values() if key["is_active"] == query["is_active"]])
+
+    async def find_one_and_update(self, query, pipeline, projection=None, return_document=None):
+        self.round_trips += 1
+        key = self.keys.get(query["id"])
+        if key is None or not key["is_active"] or key["current_usage"] >= key["max_requests_per_day"]:
+            return None
+        before = copy.deepcopy(key)
+        lease = pipeline[0]["$set"]["current_usage"]["$min"][1]["$add"][1]
+        key["current_usage"] = min(key["max_requests_per_day"], key["current_usage"] + lease)
+        return before
+
+    async def update_one(self, query, pipeline):
+        self.round_trips += 1
+        key = self.keys[query["id"]]
+        returned = pipeline[0]["$set"]["current_usage"]["$max"][1]["$subtract"][1]
+        key["current_usage"] = max(0, key["current_usage"] - returned)
+
+def _key(key_id, provider="gemini", priority=1, usage=0, limit=100):
+    return {"id": key_id, "provider": provider, "api_key": f"secret-{key_id}", "model": "model", "priority": priority,
+            "current_usage": usage, "max_requests_per_day": limit, "is_active": True}
+
+def test_requests_are_served_from_one_lease():
+    async def run():
+        collection = _KeysCollection([_key("k1")])
+        pool = KeyPool(collection, lease_size=10)
+        for _ in range(10):
+            assert (await pool.acquire("gemini"))["id"] == "k1"
+        # One load and one lease for ten requests
+        assert collection.round_trips == 2
+        assert collection.keys["k1"]["current_usage"] == 10
+        await pool.acquire("gemini")
+        assert collection.keys["k1"]["current_usage"] == 20
+
+    asyncio.run(run())
+
+def test_pools_sharing_keys_never_exceed_the_daily_limit():
+    async def run():
+        collection = _KeysCollection([_key("k1", limit=25), _key("k2", priority=0, limit=5)])
+        pools = [KeyPool(collection, lease_size=10) for _ in range(3)]
+        served = await asyncio.gather(*[pool.acquire() for pool in pools for _ in range(20)])
+        granted = [key["id"] for key in served if key is not None]
+        assert granted.count("k1") == 25 and granted.count("k2") == 5
+        assert all(key["current_usage"] <= key["max_requests_per_day"] for key in collection.keys.values())
+        assert await pools[0].acquire() is None
+
+    asyncio.run(run())
+
+def test_higher_priority_key_and_provider_filter():
+    async def run():
+        collection = _KeysCollection([_key("low", priority=0), _key("high", priority=5), _key("oa", provider="openai")])
+        pool = KeyPool(collection, lease_size=5)
+        assert (await pool.acquire("gemini"))["id"] == "high"
+        assert (await pool.acquire("openai"))["id"] == "oa"
+        assert await pool.acquire("anthropic") is None
+
+    asyncio.run(run())
+
+def test_released_reservation_is_reused_without_a_new_lease():
+    async def run():
+        collection = _KeysCollection([_key("k1", limit=1)])
+        pool = KeyPool(collection, lease_size=10)
+        assert await pool.acquire() is not None
+        assert await pool.acquire() is None
+        pool.release("k1")
+        assert (await pool.acquire())["id"] == "k1"
+        assert collection.keys["k1"]["current_usage"] == 1
+
+    asyncio.run(run())
+
+def test_reload_keeps_leases_and_drops_deactivated_keys():
+    async def run():
+        collection = _KeysCollection([_key("k1"), _key("k2", priority=0)])
+        pool = KeyPool(collection, lease_size=10)
+        await pool.acquire()
+        pool.invalidate()
+        await pool.acquire()
+        # The lease survived the reload, so no second lease was taken
+        assert collection.keys["k1"]["current_usage"] == 10
+        collection.keys["k1"]["is_active"] = False
+        pool.invalidate()
+        assert (await pool.acquire())["id"] == "k2"
+
+    asyncio.run(run())
+
+def test_close_returns_unused_reservations():
+    async def run():
+        collection = _KeysCollection([_key("k1")])
+        pool = KeyPool(collection, lease_size=10)
+        for _ in range(3):
+            await pool.acquire()
+        await pool.close()
+        assert collection.keys["k1"]["current_usage"] == 3
+
+    asyncio.run(run())
@@ -0,0 +1,33 @@
+from keywords import extract_keywords_batch
+from term_stats import TermStatsSnapshot
+
+def test_repeated_distinctive_terms_rank_first():
+    texts = [
+        "Quantum processor breakthrough: quantum qubits quantum error correction",
+        "Smartphone sales slow as smartphone makers cut prices",
+    ]
+    keywords = extract_keywords_batch(texts, top_n=2)
+    assert keywords[0][0] == "quantum"
+    assert keywords[1][0] == "smartphone"
+
+def test_terms_shared_across_the_batch_rank_below_distinctive_ones():
+    texts = [
+        "Market update: robotics funding rises",
+        "Market update: battery factory opens",
+        "Market update: satellite launch delayed",
+    ]
+    for keywords in extract_keywords_batch(texts, top_n=3):
+        assert "market" not in keywords
+    for keywords in extract_keywords_batch(texts, top_n=10):
+        assert keywords.index("market") >= 3
+
+def test_corpus_statistics_push_common_words_down():
+    text = ["Platform launches platform update for compiler compiler"]
+    stats = TermStatsSnapshot(documents=1000, frequencies={"platform": 900, "compiler": 3})
+    assert extract_keywords_batch(text, top_n=1, stats=stats) == [["compiler"]]
+
+def test_top_n_and_empty_texts():
+    keywords = extract_keywords_batch(["alpha bravo charlie delta echo", "", "the and of"], top_n=2)
+    assert len(keywords[0]) == 2
+    assert keywords[1:] == [[], []]
+    assert extract_keywords_batch([]) == []
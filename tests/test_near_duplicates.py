@@ -0,0 +1,26 @@
+from near_duplicates import NEAR_DUP_MIN_SIMILARITY, lsh_bands, minhash, similarity
+
+TITLE = "Nvidia unveils Blackwell Ultra AI chips"
+SUMMARY = ("Nvidia on Tuesday unveiled its next generation Blackwell Ultra chips for data centers, promising twice "
+           "the inference performance of the previous generation as cloud providers race to expand capacity for "
+           "large language models.")
+BOILERPLATE = " Subscribe to our newsletter for the latest tech news, analysis and deals delivered to your inbox every morning."
+
+def _similar(a: str, b: str) -> bool:
+    first, second = minhash(a), minhash(b)
+    return similarity(first, second) >= NEAR_DUP_MIN_SIMILARITY and bool(set(lsh_bands(first)) & set(lsh_bands(second)))
+
+def test_copy_with_appended_attribution_is_duplicate():
+    original = f"{TITLE} {SUMMARY}"
+    assert _similar(original, original + " the company said in a statement")
+
+def test_reworded_title_is_duplicate():
+    assert _similar(f"{TITLE} {SUMMARY}", f"Nvidia announces new Blackwell Ultra data center GPUs {SUMMARY}")
+
+def test_stories_sharing_boilerplate_are_not_duplicates():
+    other = ("Apple releases iOS 19.1 update Apple on Monday released iOS 19.1 with fixes for battery drain and a "
+             "new privacy dashboard, as the company prepares its next hardware launch later this month.")
+    assert not _similar(f"{TITLE} {SUMMARY[:100]}{BOILERPLATE}", f"{other[:130]}{BOILERPLATE}")
+
+def test_short_text_is_not_fingerprinted():
+    assert minhash("Nvidia unveils new chips") is None
@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pagination import decode_cursor, encode_cursor, keyset_query
+
+def test_cursor_round_trip_treats_naive_datetimes_as_utc():
+    created_at = datetime(2026, 3, 1, 12, 30, 15, 250000)
+    cursor = encode_cursor({"created_at": created_at, "id": "abc-123"})
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at.replace(tzinfo=timezone.utc), "abc-123")
+
+def test_invalid_cursor_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_keyset_query_continues_strictly_after_the_cursor():
+    created_at = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    cursor = encode_cursor({"created_at": created_at, "id": "b"})
+    after = {"$or": [{"created_at": {"$lt": created_at}}, {"created_at": created_at, "id": {"$lt": "b"}}]}
+    assert keyset_query({}, cursor) == after
+    assert keyset_query({"category": "ai"}, cursor) == {"$and": [{"category": "ai"}, after]}
+    assert keyset_query({"category": "ai"}, None) == {"category": "ai"}
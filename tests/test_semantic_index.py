@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+
+from semantic_index import SEMANTIC_MIN_SCORE, confirm_matches, embed_texts
+
+def test_short_tokens_embed_to_nonzero_vectors():
+    vectors = embed_texts(["LLM", "AI GPU iOS AWS"])
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+def test_acronym_query_finds_matching_document():
+    query = embed_texts(["LLM"])[0]
+    docs = embed_texts(["New LLMs from OpenAI beat benchmarks", "Football results from the weekend"])
+    scores = docs @ query
+    assert scores[0] >= SEMANTIC_MIN_SCORE
+    assert scores[0] > scores[1]
+
+def _word_salad(count: int):
+    rng = random.Random(0)
+    vocabulary = ("recipe oven bake flour butter garlic simmer roast pasta sauce match goal striker referee league "
+                  "season coach penalty stocks bonds yield inflation earnings dividend investor shares treasury "
+                  "the of and said after year week today report").split()
+    return [{"title": "", "summary": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(25, 80)))}
+            for _ in range(count)]
+
+def test_unrelated_documents_are_not_confirmed():
+    docs = _word_salad(500)
+    for query in ["quantum computing", "LLM", "AI chips", "startup funding"]:
+        assert confirm_matches(query, docs, 10) == []
+
+def test_related_documents_are_confirmed_first():
+    relevant = {"title": "OpenAI releases a new LLM",
+                "summary": "The LLM beats rivals on coding benchmarks and reaches the API next month."}
+    docs = _word_salad(50) + [relevant]
+    assert confirm_matches("LLM", docs, 3) == [relevant]
@@ -0,0 +1,45 @@
+from collections import Counter
+
+from suggest import SHORT_PREFIX_TOP, SuggestIndex
+
+def _index(docs):
+    index = SuggestIndex()
+    index.add_documents(docs)
+    return index
+
+def test_completions_rank_by_document_count_then_term():
+    index = _index([
+        {"title": "Python release", "keywords": ["python"], "tags": []},
+        {"title": "Python tooling", "keywords": [], "tags": []},
+        {"title": "Pytorch update", "keywords": [], "tags": []},
+        {"title": "Pyramid schemes", "keywords": [], "tags": []},
+    ])
+    assert [item["term"] for item in index.suggest("pyt")] == ["python", "pytorch"]
+    assert [item["term"] for item in index.suggest("py", limit=2)] == ["python", "pyramid"]
+    assert index.suggest("python")[0]["count"] == 2
+
+def test_tags_are_marked():
+    index = _index([{"title": "", "keywords": [], "tags": ["Cloud"]}])
+    assert index.suggest("cl") == [{"term": "cloud", "kind": "tag", "count": 1}]
+
+def test_short_prefix_top_k_follows_incremental_counts():
+    words = [f"zeta{a}{b}" for a in "abcdef" for b in "abcdefgh"]
+    assert len(words) > SHORT_PREFIX_TOP
+    index = _index([{"title": word, "keywords": [], "tags": []} for word in words])
+    # A term outside the precomputed top overtakes the rest once it keeps appearing
+    index.add_documents([{"title": "zetazz news", "keywords": [], "tags": []}] * 3)
+    assert index.suggest("ze", limit=1) == [{"term": "zetazz", "kind": "term", "count": 3}]
+    assert len(index.suggest("ze", limit=100)) == SHORT_PREFIX_TOP
+
+def test_bulk_load_matches_incremental_adds():
+    docs = [{"title": f"{word} story", "keywords": [word], "tags": []} for word in ["rust", "ruby", "rust", "react"]]
+    incremental = _index(docs)
+    bulk = SuggestIndex()
+    counts = Counter()
+    bulk._count_terms(docs, counts)
+    bulk._load_counts(counts)
+    for prefix in ["r", "ru", "rus", "st"]:
+        assert bulk.suggest(prefix) == incremental.suggest(prefix)
+
+def test_blank_prefix_returns_nothing():
+    assert _index([{"title": "Gadget review", "keywords": [], "tags": []}]).suggest("  ") == []
@@ -0,0 +1,59 @@
+import asyncio
+
+from pymongo.errors import BulkWriteError
+
+from tagger import DEFAULT_TAXONOMY, TagMatcher, TaxonomyStore
+
+MATCHER = TagMatcher(DEFAULT_TAXONOMY)
+
+def test_tags_do_not_match_inside_words():
+    assert MATCHER.tag("He said it would happen again") == []
+
+def test_whole_words_and_phrases_match():
+    assert MATCHER.tag("New AI app built on large language models") == ["ai", "app"]
+    assert MATCHER.tag("GPUs power generative AI in the cloud") == ["ai", "hardware", "cloud"]
+
+def test_punctuation_bounds_a_match():
+    assert MATCHER.tag("Startups (and apps) bet on A.I.") == ["ai", "app", "startup"]
+
+def test_overlapping_phrases_all_match():
+    assert MATCHER.tag("machine learning") == ["machine", "learning"]
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    async def to_list(self, length):
+        return self.docs
+
+class _TaxonomyCollection:
+    """In-memory tag_taxonomy whose first seeding write loses a race to another worker"""
+
+    def __init__(self):
+        self.docs = {}
+
+    def find(self, query, projection):
+        return _Cursor([dict(doc) for doc in self.docs.values()])
+
+    async def bulk_write(self, operations, ordered=False):
+        for operation in operations:
+            tag = operation._filter["tag"]
+            self.docs.setdefault(tag, {"tag": tag, **operation._doc["$setOnInsert"]})
+        raise BulkWriteError({"writeErrors": [{"code": 11000, "errmsg": "duplicate key"}]})
+
+def test_store_seeds_despite_a_concurrent_seed_and_picks_up_other_workers_edits():
+    async def run():
+        collection = _TaxonomyCollection()
+        store = TaxonomyStore(collection)
+        await store.load()
+        assert list(store.taxonomy) == list(DEFAULT_TAXONOMY)
+        # Another worker adds a tag; the next periodic load recompiles the matcher
+        collection.docs["robotics"] = {"tag": "robotics", "synonyms": ["robot"], "rank": len(DEFAULT_TAXONOMY)}
+        await store.load()
+        assert store.matcher.tag("A robot folds laundry") == ["robotics"]
+
+    asyncio.run(run())
@@ -0,0 +1,22 @@
+from tokenizer import normalize_token, tokenize
+
+def test_english_drops_short_words_and_stopwords():
+    assert tokenize("This Week: Python packaging gets faster") == ["week", "python", "packaging", "gets", "faster"]
+
+def test_devanagari_words_keep_their_vowel_signs():
+    assert tokenize("भारत में कृत्रिम बुद्धिमत्ता का विकास") == ["भारत", "कृत्रिम", "बुद्धिमत्ता", "विकास"]
+
+def test_devanagari_danda_and_digits_split_words():
+    assert tokenize("तकनीक।विकास २०२५") == ["तकनीक", "विकास"]
+
+def test_bengali_words_and_stopwords():
+    assert tokenize("বাংলাদেশে প্রযুক্তি এবং উদ্ভাবন") == ["বাংলাদেশে", "প্রযুক্তি", "উদ্ভাবন"]
+
+def test_indic_spelling_variants_fold_together():
+    # Nukta dropped, candrabindu folded to anusvara, zero-width joiners removed
+    assert normalize_token("फ़ोन") == normalize_token("फोन")
+    assert normalize_token("हाँ") == normalize_token("हां")
+    assert normalize_token("क्‍ष") == normalize_token("क्ष")
+
+def test_bengali_nukta_letters_are_kept():
+    assert normalize_token("নয়") != normalize_token("নয")
@@ -0,0 +1,110 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+import trending
+from trending import CMS_DEPTH, CMS_WIDTH, TREND_BUCKET_SECONDS, TREND_WINDOWS, TrendingSketches, bucket_of
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+class _BucketCollection:
+    """Just enough of a Motor collection for the bucket upserts and _id lookups TrendingSketches makes"""
+
+    def __init__(self):
+        self.docs = {}
+        self.fetched = 0
+
+    def find(self, query, projection):
+        docs = [self.docs[doc_id] for doc_id in query["_id"]["$in"] if doc_id in self.docs]
+        self.fetched += len(docs)
+        return _Cursor(docs)
+
+    async def bulk_write(self, operations, ordered=False):
+        for operation in operations:
+            update = operation._doc
+            doc = self.docs.setdefault(operation._filter["_id"], {**update["$setOnInsert"], "cms": {}, "candidates": {}})
+            for path, count in update["$inc"].items():
+                _, row, column = path.split(".")
+                cells = doc["cms"].setdefault(row, {})
+                cells[column] = cells.get(column, 0) + count
+            for path in update.get("$set", {}):
+                doc["candidates"][path.split(".", 1)[1]] = True
+
+def _brute_force_top(collection, window, scope, now):
+    """Sum every bucket of the window from scratch"""
+    current = bucket_of(now)
+    sketch = np.zeros((CMS_DEPTH, CMS_WIDTH), dtype=np.int64)
+    candidates = set()
+    buckets = 0
+    for bucket in range(current - TREND_WINDOWS[window] // TREND_BUCKET_SECONDS + 1, current + 1):
+        doc = collection.docs.get(f"{bucket}:{scope}")
+        if doc is None:
+            continue
+        buckets += 1
+        for row, columns in doc["cms"].items():
+            for column, count in columns.items():
+                sketch[int(row), int(column)] += count
+        candidates.update(doc["candidates"])
+    terms = [{"term": term, "count": int(sketch[np.arange(CMS_DEPTH), trending._cms_columns(term)].min())}
+             for term in candidates]
+    terms.sort(key=lambda item: (-item["count"], item["term"]))
+    return buckets, terms
+
+def test_sliding_window_matches_a_full_recount():
+    async def run():
+        collection = _BucketCollection()
+        sketches = TrendingSketches(collection)
+        rng = random.Random(7)
+        words = [f"term{i}" for i in range(400)]
+        start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        # Five minutes per step covers two days, so buckets settle, slide in and expire
+        for step in range(600):
+            now = start + timedelta(minutes=5 * step)
+            await sketches.record(rng.choice(["ai", "startup"]),
+                                  [[rng.choice(words[:40 + step // 2]) for _ in range(6)] for _ in range(5)], now=now)
+            if step % 9 == 0:
+                for window in TREND_WINDOWS:
+                    for category in (None, "ai"):
+                        result = await sketches.top(window, category, limit=1000, now=now)
+                        buckets, terms = _brute_force_top(collection, window, category or "all", now)
+                        assert result["buckets"] == buckets
+                        assert result["terms"] == terms[:1000]
+
+    asyncio.run(run())
+
+def test_settled_buckets_are_fetched_once():
+    async def run():
+        collection = _BucketCollection()
+        sketches = TrendingSketches(collection)
+        now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        for step in range(12):
+            await sketches.record("ai", [["robotics"]], now=now + timedelta(seconds=TREND_BUCKET_SECONDS * step))
+        later = now + timedelta(seconds=TREND_BUCKET_SECONDS * 11)
+        await sketches.top("24h", now=later)
+        collection.fetched = 0
+        result = await sketches.top("24h", now=later)
+        # Only the open buckets (current and previous) are read again
+        assert collection.fetched == 2
+        assert result["terms"] == [{"term": "robotics", "count": 12}]
+
+    asyncio.run(run())
+
+def test_cached_scopes_are_bounded(monkeypatch):
+    monkeypatch.setattr(trending, "TREND_MAX_CACHED_SCOPES", 3)
+
+    async def run():
+        sketches = TrendingSketches(_BucketCollection())
+        now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        for i in range(20):
+            await sketches.top("24h", category=f"made-up-{i}", now=now)
+        assert {scope for _, scope in sketches._windows} == {"made-up-17", "made-up-18", "made-up-19"}
+        assert {scope for _, scope in sketches._settled} <= {"made-up-17", "made-up-18", "made-up-19"}
+
+    asyncio.run(run())